@@ -63,16 +63,10 @@ class Person(RandomWalker):
         """check if person has any savings, any money in wallet, or if the
         bank can loan them any money"""
         if self.savings > 0 or self.wallet > 0 or self.bank.bank_to_loan > 0:
-            # create list of people at my location (includes self)
-            my_cell = self.model.grid.get_cell_list_contents([self.pos])
+            # pick a random other person at my location to trade with
+            customer = self.model.grid.random_cellmate(self)
             # check if other people are at my location
-            if len(my_cell) > 1:
-                # set customer to self for while loop condition
-                customer = self
-                while customer == self:
-                    """select a random person from the people at my location
-                    to trade with"""
-                    customer = self.random.choice(my_cell)
+            if customer is not None:
                 # 50% chance of trading with customer
                 if self.random.randint(0, 1) == 0:
                     # 50% chance of trading $5
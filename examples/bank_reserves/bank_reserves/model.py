@@ -14,6 +14,7 @@ import mesa
 import numpy as np
 
 from bank_reserves.agents import Bank, Person
+from bank_reserves.space import IndexedMultiGrid
 
 """
 If you want to perform a parameter sweep, call batch_run.py instead of run.py.
@@ -118,7 +119,7 @@ class BankReserves(mesa.Model):
         self.width = width
         self.init_people = init_people
         self.schedule = mesa.time.RandomActivation(self)
-        self.grid = mesa.space.MultiGrid(self.width, self.height, torus=True)
+        self.grid = IndexedMultiGrid(self.width, self.height, torus=True)
         # rich_threshold is the amount of savings a person needs to be considered "rich"
         self.rich_threshold = rich_threshold
         self.reserve_percent = reserve_percent
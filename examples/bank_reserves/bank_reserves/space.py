@@ -0,0 +1,79 @@
+"""
+MultiGrid with constant-time cellmate lookups.
+"""
+
+import mesa
+
+
+class IndexedMultiGrid(mesa.space.MultiGrid):
+    """
+    MultiGrid that keeps track of each agent's index in its cell's agent list.
+
+    Removing an agent moves the last occupant of the cell into the freed slot,
+    so placing, moving and removing agents take constant time however crowded
+    a cell is, and a random cellmate can be drawn without building a list.
+    """
+
+    def __init__(self, width, height, torus):
+        super().__init__(width, height, torus)
+        # index of every placed agent in its cell's agent list
+        self._cell_index = {}
+
+    def place_agent(self, agent, pos):
+        """Place the agent at the specified location, and set its pos variable."""
+        if agent in self._cell_index:
+            if agent.pos == pos:
+                return
+            self.remove_agent(agent)
+        x, y = pos
+        cell = self._grid[x][y]
+        self._cell_index[agent] = len(cell)
+        cell.append(agent)
+        agent.pos = pos
+        if self._empties_built:
+            self._empties.discard(pos)
+
+    def remove_agent(self, agent):
+        """Remove the agent from the grid and set its pos attribute to None."""
+        pos = agent.pos
+        x, y = pos
+        cell = self._grid[x][y]
+        index = self._cell_index.pop(agent)
+        last = cell.pop()
+        if last is not agent:
+            cell[index] = last
+            self._cell_index[last] = index
+        if self._empties_built and not cell:
+            self._empties.add(pos)
+        agent.pos = None
+
+    def get_cell_agents(self, pos):
+        """
+        Return the list of agents in the cell at pos, without copying it.
+
+        The list is owned by the grid and must not be modified. Its order
+        changes whenever an agent leaves the cell.
+        """
+        x, y = pos
+        return self._grid[x][y]
+
+    def get_cell_index(self, agent):
+        """Return the agent's index in get_cell_agents(agent.pos)."""
+        return self._cell_index[agent]
+
+    def random_cellmate(self, agent):
+        """
+        Return a random agent sharing the agent's cell, other than the agent
+        itself, or None if it is alone.
+
+        An index is drawn from the other n - 1 occupants and shifted past the
+        agent's own index, so no rejection loop is needed.
+        """
+        x, y = agent.pos
+        cell = self._grid[x][y]
+        if len(cell) < 2:
+            return None
+        index = agent.random.randrange(len(cell) - 1)
+        if index >= self._cell_index[agent]:
+            index += 1
+        return cell[index]
@@ -0,0 +1,266 @@
+"""
+Array-based engine for the Bank Reserves model.
+
+VectorizedBankReserves keeps every person's wallet, savings, loans and position
+in NumPy arrays instead of Person agents, so a step is a handful of array
+operations and one loop of plain arithmetic rather than one Python method call
+chain per person. It reports the
+same model and agent variables as BankReserves, under the same column names.
+
+A step draws everything random up front, as arrays: a random activation order
+like RandomActivation's, everyone's move to a cell of their Moore neighborhood
+(including their own cell) on a torus, whether they trade, how much, and which
+cellmate they pick. Then, as in Person.step, each person in turn moves, trades
+with a random other occupant of their new cell, and balances their own books.
+This is a loop over plain Python lists, with a few arithmetic operations per
+person and none of the agent, grid and random number calls of the object
+model, and it keeps the interleaving that shapes the results:
+
+- people who have not had their turn yet are still in their old cell, so a
+  trader only meets the people who are there at the time;
+- money paid to someone who has already had their turn stays in their wallet
+  until the next step;
+- the bank's ability to lend, which decides whether people without money can
+  still trade and how much they can borrow, changes from one person to the
+  next.
+
+The random numbers are drawn in a different order than in BankReserves, so
+the two engines agree in distribution rather than run for run.
+"""
+
+import mesa
+import numpy as np
+
+from bank_reserves.agents import Bank
+
+# Start of datacollector functions
+
+
+def get_num_rich_agents(model):
+    """return number of rich agents"""
+
+    return int(np.count_nonzero(model.savings > model.rich_threshold))
+
+
+def get_num_poor_agents(model):
+    """return number of poor agents"""
+
+    return int(np.count_nonzero(model.loans > 10))
+
+
+def get_num_mid_agents(model):
+    """return number of middle class agents"""
+
+    mid_agents = (model.loans < 10) & (model.savings < model.rich_threshold)
+    return int(np.count_nonzero(mid_agents))
+
+
+def get_total_savings(model):
+    """sum of all agents' savings"""
+
+    return np.sum(model.savings)
+
+
+def get_total_wallets(model):
+    """sum of amounts of all agents' wallets"""
+
+    return np.sum(model.wallet)
+
+
+def get_total_money(model):
+    # sum of all agents' wallets and savings
+    return get_total_wallets(model) + get_total_savings(model)
+
+
+def get_total_loans(model):
+    # sum of all agents' loans
+    return np.sum(model.loans)
+
+
+class ArrayDataCollector(mesa.DataCollector):
+    """
+    DataCollector for models that keep agent state in arrays.
+
+    Agent reporters are given as names of model attributes holding one value
+    per agent, e.g. {"Wealth": "wealth"}. Records are stored in the same
+    (Step, AgentID, ...) layout as the regular DataCollector, so
+    get_agent_vars_dataframe() and batch_run() work unchanged.
+    """
+
+    def _record_agents(self, model):
+        steps = model.schedule.steps
+        columns = [
+            getattr(model, rep.attribute_name).tolist()
+            for rep in self.agent_reporters.values()
+        ]
+        return ((steps, i, *values) for i, values in enumerate(zip(*columns)))
+
+
+class VectorizedBankReserves(mesa.Model):
+    """
+    Array-based implementation of the Bank Reserves model. See the module
+    docstring for how a step is applied and how it differs from BankReserves.
+
+    There are no Person agents and no grid, so this engine is meant for batch
+    runs rather than for the visualization server.
+    """
+
+    # grid height
+    grid_h = 20
+    # grid width
+    grid_w = 20
+
+    def __init__(
+        self,
+        height=grid_h,
+        width=grid_w,
+        init_people=2,
+        rich_threshold=10,
+        reserve_percent=50,
+        seed=None,
+    ):
+        self.height = height
+        self.width = width
+        self.init_people = init_people
+        # rich_threshold is the amount of savings a person needs to be considered "rich"
+        self.rich_threshold = rich_threshold
+        self.reserve_percent = reserve_percent
+        self.rng = np.random.default_rng(seed)
+        # the schedule holds no agents; it only keeps the step count
+        self.schedule = mesa.time.BaseScheduler(self)
+        self.datacollector = ArrayDataCollector(
+            model_reporters={
+                "Rich": get_num_rich_agents,
+                "Poor": get_num_poor_agents,
+                "Middle Class": get_num_mid_agents,
+                "Savings": get_total_savings,
+                "Wallets": get_total_wallets,
+                "Money": get_total_money,
+                "Loans": get_total_loans,
+            },
+            agent_reporters={"Wealth": "wealth"},
+        )
+
+        # create a single bank for the model
+        self.bank = Bank(1, self, self.reserve_percent)
+
+        # people, one array entry each; the index is the person's unique_id
+        self.x = self.rng.integers(self.width, size=init_people)
+        self.y = self.rng.integers(self.height, size=init_people)
+        # money may turn fractional once the bank lends out its last cents
+        self.wallet = self.rng.integers(1, rich_threshold + 2, size=init_people).astype(
+            float
+        )
+        self.savings = np.zeros(init_people)
+        self.loans = np.zeros(init_people)
+        self.wealth = np.zeros(init_people)
+        # the people in each cell, by cell index x * height + y, and the
+        # position of every person in their cell's list
+        self._cell_people = [[] for _ in range(width * height)]
+        self._cell_slot = []
+        for person, cell in enumerate((self.x * height + self.y).tolist()):
+            self._cell_slot.append(len(self._cell_people[cell]))
+            self._cell_people[cell].append(person)
+
+        self.running = True
+        self.datacollector.collect(self)
+
+    def activate(self):
+        """
+        Let everyone, in a random order, move, trade with a random cellmate
+        and then deposit, withdraw, borrow and repay, as Person.step does,
+        keeping the bank up to date after each turn.
+        """
+        n = self.init_people
+        width, height = self.width, self.height
+        bank = self.bank
+        keep = 1 - self.reserve_percent / 100
+
+        order = self.rng.permutation(n).tolist()
+        dx = self.rng.integers(-1, 2, size=n).tolist()
+        dy = self.rng.integers(-1, 2, size=n).tolist()
+        # 50% chance of trading, then 50% chance of $5 rather than $2
+        trades = (self.rng.random(n) < 0.5).tolist()
+        amount = np.where(self.rng.random(n) < 0.5, 5, 2).tolist()
+        pick = self.rng.random(n).tolist()
+
+        x, y = self.x.tolist(), self.y.tolist()
+        cell_people, cell_slot = self._cell_people, self._cell_slot
+        wallet = self.wallet.tolist()
+        savings = self.savings.tolist()
+        loans = self.loans.tolist()
+        deposits, bank_loans = bank.deposits, bank.bank_loans
+        bank_to_loan = bank.bank_to_loan
+
+        for person in order:
+            # move, swapping the last person of the old cell into our slot
+            old_cell = x[person] * height + y[person]
+            x[person] = (x[person] + dx[person]) % width
+            y[person] = (y[person] + dy[person]) % height
+            cell = x[person] * height + y[person]
+            if cell != old_cell:
+                people = cell_people[old_cell]
+                last = people.pop()
+                if last != person:
+                    people[cell_slot[person]] = last
+                    cell_slot[last] = cell_slot[person]
+                cell_slot[person] = len(cell_people[cell])
+                cell_people[cell].append(person)
+
+            people = cell_people[cell]
+            if (
+                trades[person]
+                and len(people) > 1
+                and (savings[person] > 0 or wallet[person] > 0 or bank_to_loan > 0)
+            ):
+                # draw one of the other occupants, skipping over oneself
+                index = int(pick[person] * (len(people) - 1))
+                if index >= cell_slot[person]:
+                    index += 1
+                wallet[people[index]] += amount[person]
+                wallet[person] -= amount[person]
+
+            cash, saved, owed = wallet[person], savings[person], loans[person]
+            if cash < 0:
+                # cover the balance from savings as far as possible, and
+                # borrow the rest, or whatever the bank can lend right now
+                withdrawal = min(saved, -cash)
+                cash += withdrawal
+                saved -= withdrawal
+                deposits -= withdrawal
+                if cash < 0:
+                    loan = min(bank_to_loan, -cash)
+                    cash += loan
+                    owed += loan
+                    bank_loans += loan
+            else:
+                saved += cash
+                deposits += cash
+                cash = 0
+            if owed > 0 and saved > 0:
+                repayment = min(saved, owed)
+                saved -= repayment
+                owed -= repayment
+                deposits -= repayment
+                bank_loans -= repayment
+            wallet[person], savings[person], loans[person] = cash, saved, owed
+            bank_to_loan = keep * deposits - bank_loans
+
+        self.x, self.y = np.array(x), np.array(y)
+        self.wallet = np.array(wallet, dtype=float)
+        self.savings = np.array(savings, dtype=float)
+        self.loans = np.array(loans, dtype=float)
+        self.wealth = self.savings - self.loans
+        bank.deposits, bank.bank_loans = deposits, bank_loans
+        bank.bank_balance()
+
+    def step(self):
+        self.activate()
+        # advance the step count used by the datacollector
+        self.schedule.step()
+        # collect data
+        self.datacollector.collect(self)
+
+    def run_model(self, step_count=1000):
+        for i in range(step_count):
+            self.step()
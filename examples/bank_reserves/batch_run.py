@@ -31,6 +31,7 @@ import numpy as np
 import pandas as pd
 
 from bank_reserves.agents import Bank, Person
+from bank_reserves.space import IndexedMultiGrid
 
 # Start of datacollector functions
 
@@ -130,7 +131,7 @@ class BankReservesModel(mesa.Model):
         self.width = width
         self.init_people = init_people
         self.schedule = mesa.time.RandomActivation(self)
-        self.grid = mesa.space.MultiGrid(self.width, self.height, torus=True)
+        self.grid = IndexedMultiGrid(self.width, self.height, torus=True)
         # rich_threshold is the amount of savings a person needs to be considered "rich"
         self.rich_threshold = rich_threshold
         self.reserve_percent = reserve_percent
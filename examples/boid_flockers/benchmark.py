@@ -0,0 +1,68 @@
+"""
+Benchmark neighbor queries of the spatial hash against Mesa's brute-force
+ContinuousSpace.
+
+For each population size the space is scaled so that the density of agents
+stays the same, as it would when running bigger flocks. Single radius queries
+are timed on a sample of agents and scaled up to one query per agent, which is
+what one step of BoidFlockers performs.
+
+Run it from this directory:
+
+    $ python benchmark.py
+"""
+
+import time
+
+import mesa
+import numpy as np
+
+from boid_flockers.space import SpatialHashContinuousSpace
+
+VISION = 10
+# agents per unit area, the same as the default BoidFlockers model
+DENSITY = 100 / (100 * 100)
+SAMPLE = 1000
+
+
+def make_space(space, population, rng):
+    model = mesa.Model()
+    agents = [mesa.Agent(i, model) for i in range(population)]
+    for agent in agents:
+        space.place_agent(agent, tuple(rng.random(2) * space.size))
+    return agents
+
+
+def time_queries(space, agents):
+    """Seconds for one radius query per agent, estimated from a sample."""
+    sample = agents[:SAMPLE]
+    start = time.perf_counter()
+    for agent in sample:
+        space.get_neighbors(agent.pos, VISION, False)
+    return (time.perf_counter() - start) * len(agents) / len(sample)
+
+
+def time_batched(space):
+    start = time.perf_counter()
+    space.get_all_neighbors(VISION)
+    return time.perf_counter() - start
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'agents':>8} {'brute force':>12} {'hash':>12} {'hash batched':>13}")
+    for population in (1_000, 10_000, 100_000):
+        side = (population / DENSITY) ** 0.5
+        brute = mesa.space.ContinuousSpace(side, side, True)
+        hashed = SpatialHashContinuousSpace(side, side, True, cell_size=VISION)
+        brute_time = time_queries(brute, make_space(brute, population, rng))
+        hashed_time = time_queries(hashed, make_space(hashed, population, rng))
+        batched_time = time_batched(hashed)
+        print(
+            f"{population:>8} {brute_time:>11.3f}s {hashed_time:>11.3f}s"
+            f" {batched_time:>12.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
+import base64
+import json
+
 import mesa
+import numpy as np
 
 
 class SimpleCanvas(mesa.visualization.VisualizationElement):
@@ -7,19 +11,34 @@ class SimpleCanvas(mesa.visualization.VisualizationElement):
     canvas_height = 500
     canvas_width = 500
 
-    def __init__(self, portrayal_method, canvas_height=500, canvas_width=500):
+    def __init__(
+        self,
+        portrayal_method,
+        canvas_height=500,
+        canvas_width=500,
+        binary=False,
+    ):
         """
         Instantiate a new SimpleCanvas
+
+        Args:
+            portrayal_method: Function returning the portrayal dict of an agent.
+            canvas_height, canvas_width: Size of the canvas in pixels.
+            binary: If True, send frames as packed Float32 positions, with
+                    each distinct portrayal sent once; see render_binary().
         """
         self.portrayal_method = portrayal_method
         self.canvas_height = canvas_height
         self.canvas_width = canvas_width
+        self.binary = binary
         new_element = "new Simple_Continuous_Module({}, {})".format(
             self.canvas_width, self.canvas_height
         )
         self.js_code = "elements.push(" + new_element + ");"
 
     def render(self, model):
+        if self.binary:
+            return self.render_binary(model)
         space_state = []
         for obj in model.schedule.agents:
             portrayal = self.portrayal_method(obj)
@@ -30,3 +49,41 @@ class SimpleCanvas(mesa.visualization.VisualizationElement):
             portrayal["y"] = y
             space_state.append(portrayal)
         return space_state
+
+    def render_binary(self, model):
+        """
+        Render the agents as a compact frame.
+
+        The normalized positions of all agents are packed into one
+        little-endian Float32 buffer, (x0, y0, x1, y1, ...), sent as a base64
+        string, which is far cheaper to encode and parse than one object per
+        agent. Agents mostly share a few portrayals, so each distinct
+        portrayal is sent once, and every agent gets the index of its own in a
+        packed little-endian Uint32 buffer.
+
+        Every frame is complete in itself: the element is shared by all
+        browser tabs connected to the server, which each receive only the
+        frames they ask for, so nothing is assumed about earlier frames.
+        """
+        agents = model.schedule.agents
+        portrayals = []
+        indices = {}
+        styles = np.empty(len(agents), dtype="<u4")
+        for i, agent in enumerate(agents):
+            portrayal = self.portrayal_method(agent)
+            key = json.dumps(portrayal, sort_keys=True)
+            if key not in indices:
+                indices[key] = len(portrayals)
+                portrayals.append(portrayal)
+            styles[i] = indices[key]
+
+        space = model.space
+        positions = np.array([agent.pos for agent in agents], dtype=float)
+        positions = (positions - (space.x_min, space.y_min)) / space.size
+        buffer = positions.astype("<f4").tobytes()
+        return {
+            "binary": True,
+            "positions": base64.b64encode(buffer).decode("ascii"),
+            "portrayals": portrayals,
+            "styles": base64.b64encode(styles.tobytes()).decode("ascii"),
+        }
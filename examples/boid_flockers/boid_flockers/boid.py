@@ -54,28 +54,20 @@ class Boid(mesa.Agent):
         self.separate_factor = separate
         self.match_factor = match
 
-    def cohere(self, neighbors):
+    def cohere(self, headings):
         """
         Return the vector toward the center of mass of the local neighbors.
         """
         cohere = np.zeros(2)
-        if neighbors:
-            for neighbor in neighbors:
-                cohere += self.model.space.get_heading(self.pos, neighbor.pos)
-            cohere /= len(neighbors)
+        if len(headings):
+            cohere = headings.sum(axis=0) / len(headings)
         return cohere
 
-    def separate(self, neighbors):
+    def separate(self, headings, distances):
         """
         Return a vector away from any neighbors closer than separation dist.
         """
-        me = self.pos
-        them = (n.pos for n in neighbors)
-        separation_vector = np.zeros(2)
-        for other in them:
-            if self.model.space.get_distance(me, other) < self.separation:
-                separation_vector -= self.model.space.get_heading(me, other)
-        return separation_vector
+        return -headings[distances < self.separation].sum(axis=0)
 
     def match_heading(self, neighbors):
         """
@@ -91,12 +83,17 @@ class Boid(mesa.Agent):
     def step(self):
         """
         Get the Boid's neighbors, compute the new vector, and move accordingly.
+
+        The headings and distances to the neighbors are measured once, for
+        all of them at once, and shared by the three behaviors.
         """
 
-        neighbors = self.model.space.get_neighbors(self.pos, self.vision, False)
+        neighbors, headings, distances = self.model.space.get_neighbor_displacements(
+            self.pos, self.vision, False
+        )
         self.velocity += (
-            self.cohere(neighbors) * self.cohere_factor
-            + self.separate(neighbors) * self.separate_factor
+            self.cohere(headings) * self.cohere_factor
+            + self.separate(headings, distances) * self.separate_factor
             + self.match_heading(neighbors) * self.match_factor
         ) / 2
         self.velocity /= np.linalg.norm(self.velocity)
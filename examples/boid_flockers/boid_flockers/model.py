@@ -9,6 +9,7 @@ import mesa
 import numpy as np
 
 from .boid import Boid
+from .space import SpatialHashContinuousSpace
 
 
 class BoidFlockers(mesa.Model):
@@ -45,7 +46,7 @@ class BoidFlockers(mesa.Model):
         self.speed = speed
         self.separation = separation
         self.schedule = mesa.time.RandomActivation(self)
-        self.space = mesa.space.ContinuousSpace(width, height, True)
+        self.space = SpatialHashContinuousSpace(width, height, True, cell_size=vision)
         self.factors = dict(cohere=cohere, separate=separate, match=match)
         self.make_agents()
         self.running = True
@@ -8,7 +8,7 @@ def boid_draw(agent):
     return {"Shape": "circle", "r": 2, "Filled": "true", "Color": "Red"}
 
 
-boid_canvas = SimpleCanvas(boid_draw, 500, 500)
+boid_canvas = SimpleCanvas(boid_draw, 500, 500, binary=True)
 model_params = {
     "population": 100,
     "width": 100,
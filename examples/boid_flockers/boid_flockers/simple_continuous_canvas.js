@@ -70,10 +70,28 @@ const Simple_Continuous_Module = function(canvas_width, canvas_height) {
 
 	this.render = function(data) {
 		canvasDraw.resetCanvas();
-		canvasDraw.draw(data);
+		if (data.binary)
+			canvasDraw.draw(decodeFrame(data));
+		else
+			canvasDraw.draw(data);
 	};
 
 	this.reset = function() {
 		canvasDraw.resetCanvas();
 	};
+
+	// Combine the packed Float32 positions of a binary frame with the
+	// portrayal of each agent, given by its index in the frame's portrayals.
+	const decodeFrame = function(data) {
+		const positions = new Float32Array(decodeBuffer(data.positions));
+		const styles = new Uint32Array(decodeBuffer(data.styles));
+		const objects = [];
+		for (let i = 0; i < styles.length; i++)
+			objects.push({...data.portrayals[styles[i]], x: positions[2 * i], y: positions[2 * i + 1]});
+		return objects;
+	};
+
+	const decodeBuffer = function(text) {
+		return Uint8Array.from(atob(text), c => c.charCodeAt(0)).buffer;
+	};
 };
@@ -0,0 +1,308 @@
+"""
+A ContinuousSpace backed by a uniform-grid spatial hash.
+"""
+
+import itertools
+
+import mesa
+import numpy as np
+
+
+def cell_pairs(cell_xy, cells, rings, torus):
+    """
+    Return all candidate pairs of points lying in the same or nearby cells.
+
+    Args:
+        cell_xy: (N, 2) integer array with the cell column and row of each point.
+        cells: (columns, rows) of the cell grid.
+        rings: How many cells around a point's own cell to search, per axis.
+        torus: Whether the cell grid wraps around at its edges.
+
+    Returns:
+        Arrays (i, j) of point indices, one entry per ordered pair of points
+        whose cells are at most rings apart, including i == j.
+    """
+    n = len(cell_xy)
+    cell = cell_xy[:, 0] * cells[1] + cell_xy[:, 1]
+    order = np.argsort(cell, kind="stable")
+    counts = np.bincount(cell, minlength=cells[0] * cells[1])
+    starts = np.cumsum(counts) - counts
+
+    offsets = []
+    for axis in range(2):
+        steps = range(-rings[axis], rings[axis] + 1)
+        if torus:
+            # offsets that wrap onto the same cell must only be searched once
+            steps = sorted({step % cells[axis] for step in steps})
+        offsets.append(steps)
+
+    i_parts, j_parts = [], []
+    for dx, dy in itertools.product(*offsets):
+        other_xy = cell_xy + (dx, dy)
+        if torus:
+            other_xy %= cells
+            inside = np.arange(n)
+        else:
+            (inside,) = np.nonzero(np.all((other_xy >= 0) & (other_xy < cells), axis=1))
+        other = other_xy[inside, 0] * cells[1] + other_xy[inside, 1]
+        other_counts = counts[other]
+        offset = np.arange(other_counts.sum()) - np.repeat(
+            np.cumsum(other_counts) - other_counts, other_counts
+        )
+        i_parts.append(np.repeat(inside, other_counts))
+        j_parts.append(order[np.repeat(starts[other], other_counts) + offset])
+    return np.concatenate(i_parts), np.concatenate(j_parts)
+
+
+class SpatialHashContinuousSpace(mesa.space.ContinuousSpace):
+    """
+    Continuous space that buckets agents into a uniform grid of cells.
+
+    A radius query only looks at agents in the cells overlapping the search
+    radius instead of at every agent in the space, so with cells about as
+    wide as the typical query radius a query costs in proportion to the
+    number of nearby agents. Cells are updated incrementally whenever an
+    agent moves.
+
+    Neighbors are returned in the order the agents were placed, the same as
+    ContinuousSpace.get_neighbors does as long as no agent has been removed.
+
+    With few agents, looking up the cells costs more than measuring the
+    distance to every agent, so below brute_force_max agents a query simply
+    checks them all, like ContinuousSpace.
+    """
+
+    # largest number of agents for which queries check every agent
+    brute_force_max = 500
+
+    def __init__(self, x_max, y_max, torus, x_min=0, y_min=0, cell_size=None):
+        """Create a new continuous space.
+
+        Args:
+            x_max, y_max: Maximum x and y coordinates for the space.
+            torus: Boolean for whether the edges loop around.
+            x_min, y_min: (default 0) If provided, set the minimum x and y
+                          coordinates for the space.
+            cell_size: Smallest width and height of a cell of the spatial
+                       hash. Use about the radius of the most frequent
+                       query; defaults to a tenth of the smaller side.
+        """
+        super().__init__(x_max, y_max, torus, x_min, y_min)
+        if cell_size is None:
+            cell_size = min(self.width, self.height) / 10
+        self.cells = np.maximum((self.size // cell_size).astype(int), 1)
+        self.cell_size = self.size / self.cells
+        self.origin = np.array((x_min, y_min), dtype=float)
+
+        # agents are stored in slots; _points and _slot_cells are indexed by slot
+        self._slot_agents = []
+        self._agent_slots = {}
+        self._points = np.empty((0, 2))
+        self._slot_cells = np.empty((0, 2), dtype=int)
+        self._cell_slots = {}
+
+    @property
+    def agents(self):
+        """Agents in the space, in slot order; see get_all_neighbors()."""
+        return self._slot_agents
+
+    @property
+    def points(self):
+        """(N, 2) array of agent positions, in slot order."""
+        return self._points[: len(self._slot_agents)]
+
+    def _cell_of(self, pos):
+        cell = ((np.asarray(pos, dtype=float) - self.origin) // self.cell_size).astype(
+            int
+        )
+        # guard against positions rounding onto the far edge
+        return np.minimum(cell, self.cells - 1)
+
+    def _add_to_cell(self, slot, cell):
+        self._slot_cells[slot] = cell
+        self._cell_slots.setdefault(tuple(cell), {})[slot] = None
+
+    def _remove_from_cell(self, slot):
+        cell = tuple(self._slot_cells[slot])
+        members = self._cell_slots[cell]
+        del members[slot]
+        if not members:
+            del self._cell_slots[cell]
+
+    def place_agent(self, agent, pos):
+        """Place a new agent in the space.
+
+        Args:
+            agent: Agent object to place.
+            pos: Coordinate tuple for where to place the agent.
+        """
+        if agent in self._agent_slots:
+            self.move_agent(agent, pos)
+            return
+        pos = self.torus_adj(pos)
+        agent.pos = pos
+        slot = len(self._slot_agents)
+        if slot == len(self._points):
+            capacity = max(2 * slot, 16)
+            self._points = np.resize(self._points, (capacity, 2))
+            self._slot_cells = np.resize(self._slot_cells, (capacity, 2))
+        self._slot_agents.append(agent)
+        self._agent_slots[agent] = slot
+        self._points[slot] = pos
+        self._add_to_cell(slot, self._cell_of(pos))
+
+    def move_agent(self, agent, pos):
+        """Move an agent from its current position to a new position.
+
+        Args:
+            agent: The agent object to move.
+            pos: Coordinate tuple to move the agent to.
+        """
+        pos = self.torus_adj(pos)
+        agent.pos = pos
+        slot = self._agent_slots[agent]
+        self._points[slot] = pos
+        cell = self._cell_of(pos)
+        if np.any(cell != self._slot_cells[slot]):
+            self._remove_from_cell(slot)
+            self._add_to_cell(slot, cell)
+
+    def remove_agent(self, agent):
+        """Remove an agent from the space.
+
+        Args:
+            agent: The agent object to remove
+        """
+        if agent not in self._agent_slots:
+            raise Exception("Agent does not exist in the space")
+        slot = self._agent_slots.pop(agent)
+        self._remove_from_cell(slot)
+        # move the agent in the last slot into the freed one
+        last = len(self._slot_agents) - 1
+        last_agent = self._slot_agents.pop()
+        if slot != last:
+            self._remove_from_cell(last)
+            self._slot_agents[slot] = last_agent
+            self._agent_slots[last_agent] = slot
+            self._points[slot] = self._points[last]
+            self._add_to_cell(slot, self._slot_cells[last].copy())
+        agent.pos = None
+
+    def _rings(self, radius):
+        """Number of cells around a cell to search for the given radius."""
+        return np.ceil(radius / self.cell_size).astype(int)
+
+    def _deltas(self, points, pos):
+        deltas = np.abs(points - pos)
+        if self.torus:
+            deltas = np.minimum(deltas, self.size - deltas)
+        return deltas
+
+    def _nearby_slots(self, pos, radius):
+        """
+        Return the slots of the agents in the cells within radius of pos, or
+        of all agents if there are few of them.
+        """
+        if len(self._slot_agents) <= self.brute_force_max:
+            return np.arange(len(self._slot_agents))
+        cell = ((np.asarray(pos, dtype=float) - self.origin) // self.cell_size).astype(
+            int
+        )
+        columns, rows = (
+            range(c - r, c + r + 1) for c, r in zip(cell, self._rings(radius))
+        )
+        if self.torus:
+            columns = {x % self.cells[0] for x in columns}
+            rows = {y % self.cells[1] for y in rows}
+        else:
+            columns = range(max(columns.start, 0), min(columns.stop, self.cells[0]))
+            rows = range(max(rows.start, 0), min(rows.stop, self.cells[1]))
+        nearby = [
+            self._cell_slots.get(key, ()) for key in itertools.product(columns, rows)
+        ]
+        return np.fromiter(
+            itertools.chain.from_iterable(nearby),
+            dtype=int,
+            count=sum(len(c) for c in nearby),
+        )
+
+    def _query(self, pos, radius, include_center=True):
+        """
+        Return the slots of the agents within radius of pos, in slot order,
+        and their squared distances from pos.
+        """
+        slots = self._nearby_slots(pos, radius)
+        deltas = self._deltas(self._points[slots], np.asarray(pos))
+        dists = deltas[:, 0] ** 2 + deltas[:, 1] ** 2
+        within = dists <= radius**2
+        if not include_center:
+            within &= dists > 0
+        slots, dists = slots[within], dists[within]
+        order = np.argsort(slots)
+        return slots[order], dists[order]
+
+    def get_neighbors(self, pos, radius, include_center=True):
+        """Get all agents within a certain radius.
+
+        Args:
+            pos: (x,y) coordinate tuple to center the search at.
+            radius: Get all the objects within this distance of the center.
+            include_center: If True, include an object at the *exact* provided
+                            coordinates. i.e. if you are searching for the
+                            neighbors of a given agent, True will include that
+                            agent in the results.
+        """
+        return [
+            self._slot_agents[slot]
+            for slot in self._query(pos, radius, include_center)[0]
+        ]
+
+    def get_neighbor_displacements(self, pos, radius, include_center=True):
+        """Get all agents within a certain radius, and where they are.
+
+        Args:
+            pos, radius, include_center: As for get_neighbors().
+
+        Returns:
+            The list of neighbors, as get_neighbors() returns it, and arrays
+            of the heading from pos to each of them, as get_heading()
+            measures it, and of their distances from pos.
+        """
+        slots, dists = self._query(pos, radius, include_center)
+        pos = np.asarray(pos, dtype=float)
+        points = self._points[slots]
+        if self.torus:
+            headings = (points - self.center) % self.size - (
+                pos - self.center
+            ) % self.size
+        else:
+            headings = points - pos
+        return (
+            [self._slot_agents[slot] for slot in slots],
+            headings,
+            np.sqrt(dists),
+        )
+
+    def get_all_neighbors(self, radius, include_center=False):
+        """Get the neighbors of all agents at once.
+
+        Args:
+            radius: Get all the objects within this distance of each agent.
+            include_center: If True, include other agents at the *exact*
+                            same position. An agent is never its own neighbor.
+
+        Returns:
+            Arrays (i, j) of slots, one entry per ordered pair, with agent
+            space.agents[j] a neighbor of agent space.agents[i].
+        """
+        n = len(self._slot_agents)
+        i, j = cell_pairs(
+            self._slot_cells[:n], self.cells, self._rings(radius), self.torus
+        )
+        points = self._points
+        deltas = self._deltas(points[j], points[i])
+        dists = deltas[:, 0] ** 2 + deltas[:, 1] ** 2
+        within = (dists <= radius**2) & (i != j)
+        if not include_center:
+            within &= dists > 0
+        return i[within], j[within]
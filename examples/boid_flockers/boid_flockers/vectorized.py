@@ -0,0 +1,223 @@
+"""
+Vectorized Flockers
+=============================================================
+An array-based engine for the Boids flocker model. All positions and
+velocities are kept in (N, 2) numpy arrays, neighbors are found once per step
+with a uniform grid of cells about as wide as the vision radius, and the three
+flocking drives are computed as masked sums over all neighbor pairs at once.
+
+Headings between boids are measured the same way as
+ContinuousSpace.get_heading does on a torus: both points are shifted into a
+frame centered on the space and subtracted, so that results can be compared
+with the per-agent BoidFlockers model.
+"""
+
+import mesa
+import numpy as np
+
+from .space import cell_pairs
+
+
+def neighbor_pairs(points, radius, size):
+    """
+    Find all pairs of distinct points within radius of each other on a torus.
+
+    Points are binned into a grid of cells at least radius wide, so only the
+    3x3 block of cells around each point has to be searched.
+
+    Args:
+        points: (N, 2) array of positions inside [0, size).
+        radius: Search radius.
+        size: (width, height) of the torus.
+
+    Returns:
+        Arrays (i, j) of point indices, one entry per ordered pair, with
+        point j a neighbor of point i.
+    """
+    if radius > 0:
+        cells = np.maximum((size // radius).astype(int), 1)
+    else:
+        cells = np.ones(2, dtype=int)
+    cell_xy = (points // (size / cells)).astype(int) % cells
+    i, j = cell_pairs(cell_xy, cells, np.ones(2, dtype=int), torus=True)
+
+    delta = np.abs(points[j] - points[i])
+    delta = np.minimum(delta, size - delta)
+    distance2 = delta[:, 0] ** 2 + delta[:, 1] ** 2
+    # like ContinuousSpace.get_neighbors, leave out points at the exact same
+    # position, which includes each point itself
+    within = (distance2 <= radius**2) & (distance2 > 0)
+    return i[within], j[within]
+
+
+class VectorizedBoidFlockers(mesa.Model):
+    """
+    Flocker model class keeping all boids in arrays.
+
+    Two activation regimes are supported:
+        - "simultaneous": every boid steers based on where all boids were at
+          the start of the step. The whole step is a few array operations,
+          which scales to 10^4-10^5 boids.
+        - "random": boids move one at a time in a random order, each seeing
+          the boids activated before it at their new positions, exactly like
+          BoidFlockers with its RandomActivation scheduler. Each boid's step is
+          vectorized over the other boids, but the step as a whole is a
+          Python loop, so this is mostly useful for checking results against
+          the per-agent model.
+    """
+
+    def __init__(
+        self,
+        population=100,
+        width=100,
+        height=100,
+        speed=1,
+        vision=10,
+        separation=2,
+        cohere=0.025,
+        separate=0.25,
+        match=0.04,
+        activation="simultaneous",
+        seed=None,
+    ):
+        """
+        Create a new vectorized Flockers model.
+
+        Args:
+            population: Number of Boids
+            width, height: Size of the space.
+            speed: How fast should the Boids move.
+            vision: How far around should each Boid look for its neighbors
+            separation: What's the minimum distance each Boid will attempt to
+                    keep from any other
+            cohere, separate, match: factors for the relative importance of
+                    the three drives.
+            activation: "simultaneous" or "random", see the class docstring.
+            seed: Seed for the random number generators."""
+        if activation not in ("simultaneous", "random"):
+            raise ValueError(f"Unknown activation: {activation}")
+        self.population = population
+        self.vision = vision
+        self.speed = speed
+        self.separation = separation
+        self.activation = activation
+        self.size = np.array((width, height), dtype=float)
+        self.center = self.size / 2
+        self.factors = dict(cohere=cohere, separate=separate, match=match)
+        self.rng = np.random.default_rng(seed)
+        # the schedule holds no agents; it only keeps the step count
+        self.schedule = mesa.time.BaseScheduler(self)
+        self.positions = self.rng.random((population, 2)) * self.size
+        self.velocities = self.rng.random((population, 2)) * 2 - 1
+        self.running = True
+
+    @classmethod
+    def from_model(cls, model, activation="random"):
+        """
+        Create a vectorized copy of a BoidFlockers model.
+
+        Positions, velocities and the state of the model's random number
+        generator are copied, so that with random activation both models go
+        on to produce the same trajectories.
+        """
+        boids = model.schedule.agents
+        first = boids[0]
+        vectorized = cls(
+            population=len(boids),
+            width=model.space.width,
+            height=model.space.height,
+            speed=first.speed,
+            vision=first.vision,
+            separation=first.separation,
+            cohere=first.cohere_factor,
+            separate=first.separate_factor,
+            match=first.match_factor,
+            activation=activation,
+        )
+        # BoidFlockers keeps agents in order of their unique_id
+        vectorized.positions = np.array([boid.pos for boid in boids], dtype=float)
+        vectorized.velocities = np.array([boid.velocity for boid in boids])
+        vectorized.random.setstate(model.random.getstate())
+        return vectorized
+
+    def heading(self, pos_1, pos_2):
+        """Heading vectors from pos_1 to pos_2, as ContinuousSpace.get_heading."""
+        return (pos_2 - self.center) % self.size - (pos_1 - self.center) % self.size
+
+    def steer(self, velocity, cohere, separate, match):
+        """Return the new velocities for the given drives, normalized."""
+        factors = self.factors
+        velocity = (
+            velocity
+            + (
+                cohere * factors["cohere"]
+                + separate * factors["separate"]
+                + match * factors["match"]
+            )
+            / 2
+        )
+        return velocity / np.linalg.norm(velocity, axis=-1, keepdims=True)
+
+    def step_simultaneous(self):
+        """Move all boids based on the positions at the start of the step."""
+        positions, velocities = self.positions, self.velocities
+        n = self.population
+        i, j = neighbor_pairs(positions, self.vision, self.size)
+        heading = self.heading(positions[i], positions[j])
+        delta = np.abs(positions[j] - positions[i])
+        delta = np.minimum(delta, self.size - delta)
+        distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+
+        def pair_sum(values, mask=None):
+            """Sum the per-pair values over each boid's neighbors."""
+            index, values = (i, values) if mask is None else (i[mask], values[mask])
+            return np.stack(
+                [np.bincount(index, values[:, k], minlength=n) for k in range(2)],
+                axis=1,
+            )
+
+        count = np.bincount(i, minlength=n)[:, None]
+        has_neighbors = count > 0
+        cohere = np.divide(
+            pair_sum(heading), count, out=np.zeros((n, 2)), where=has_neighbors
+        )
+        separate = -pair_sum(heading, distance < self.separation)
+        match = np.divide(
+            pair_sum(velocities[j]), count, out=np.zeros((n, 2)), where=has_neighbors
+        )
+
+        self.velocities = self.steer(velocities, cohere, separate, match)
+        self.positions = (positions + self.velocities * self.speed) % self.size
+
+    def step_random(self):
+        """Move the boids one at a time, in a random order."""
+        positions, velocities = self.positions, self.velocities
+        # shuffle the same way RandomActivation shuffles agent keys
+        order = list(range(self.population))
+        self.random.shuffle(order)
+        for k in order:
+            pos = positions[k]
+            delta = np.abs(positions - pos)
+            delta = np.minimum(delta, self.size - delta)
+            distance2 = delta[:, 0] ** 2 + delta[:, 1] ** 2
+            (neighbors,) = np.nonzero((distance2 <= self.vision**2) & (distance2 > 0))
+
+            cohere = np.zeros(2)
+            match = np.zeros(2)
+            heading = self.heading(pos, positions[neighbors])
+            if len(neighbors):
+                cohere = heading.sum(axis=0) / len(neighbors)
+                match = velocities[neighbors].sum(axis=0) / len(neighbors)
+            too_close = np.sqrt(distance2[neighbors]) < self.separation
+            separate = -heading[too_close].sum(axis=0)
+
+            velocities[k] = self.steer(velocities[k], cohere, separate, match)
+            positions[k] = (pos + velocities[k] * self.speed) % self.size
+
+    def step(self):
+        if self.activation == "simultaneous":
+            self.step_simultaneous()
+        else:
+            self.step_random()
+        # advance the step count
+        self.schedule.step()
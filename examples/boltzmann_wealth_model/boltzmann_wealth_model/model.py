@@ -1,12 +1,13 @@
 import mesa
 
+from .space import IndexedMultiGrid
+from .wealth import WealthHistogram, gini
+
 
 def compute_gini(model):
-    agent_wealths = [agent.wealth for agent in model.schedule.agents]
-    x = sorted(agent_wealths)
-    N = model.num_agents
-    B = sum(xi * (N - i) for i, xi in enumerate(x)) / (N * sum(x))
-    return 1 + (1 / N) - 2 * B
+    if model.wealth_histogram.valid:
+        return model.wealth_histogram.gini()
+    return gini([agent.wealth for agent in model.schedule.agents])
 
 
 class BoltzmannWealthModel(mesa.Model):
@@ -19,8 +20,10 @@ class BoltzmannWealthModel(mesa.Model):
 
     def __init__(self, N=100, width=10, height=10):
         self.num_agents = N
-        self.grid = mesa.space.MultiGrid(width, height, True)
+        self.grid = IndexedMultiGrid(width, height, True)
         self.schedule = mesa.time.RandomActivation(self)
+        # number of agents at each wealth, kept up to date by the agents
+        self.wealth_histogram = WealthHistogram()
         self.datacollector = mesa.DataCollector(
             model_reporters={"Gini": compute_gini}, agent_reporters={"Wealth": "wealth"}
         )
@@ -51,8 +54,18 @@ class MoneyAgent(mesa.Agent):
 
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model)
+        self._wealth = None
         self.wealth = 1
 
+    @property
+    def wealth(self):
+        return self._wealth
+
+    @wealth.setter
+    def wealth(self, wealth):
+        self.model.wealth_histogram.move(self._wealth, wealth)
+        self._wealth = wealth
+
     def move(self):
         possible_steps = self.model.grid.get_neighborhood(
             self.pos, moore=True, include_center=False
@@ -61,12 +74,9 @@ class MoneyAgent(mesa.Agent):
         self.model.grid.move_agent(self, new_position)
 
     def give_money(self):
-        cellmates = self.model.grid.get_cell_list_contents([self.pos])
-        cellmates.pop(
-            cellmates.index(self)
-        )  # Ensure agent is not giving money to itself
-        if len(cellmates) > 0:
-            other = self.random.choice(cellmates)
+        # Ensure agent is not giving money to itself
+        other = self.model.grid.random_cellmate(self)
+        if other is not None:
             other.wealth += 1
             self.wealth -= 1
 
@@ -1,30 +1,53 @@
 import mesa
-import networkx as nx
+import numpy as np
+
+from .graphs import make_graph
+from .space import OccupancyNetworkGrid
+from .wealth import WealthHistogram, gini
 
 
 def compute_gini(model):
-    agent_wealths = [agent.wealth for agent in model.schedule.agents]
-    x = sorted(agent_wealths)
-    N = model.num_agents
-    B = sum(xi * (N - i) for i, xi in enumerate(x)) / (N * sum(x))
-    return 1 + (1 / N) - 2 * B
+    if model.wealth_histogram.valid:
+        return model.wealth_histogram.gini()
+    return gini([agent.wealth for agent in model.schedule.agents])
 
 
 class BoltzmannWealthModelNetwork(mesa.Model):
     """A model with some number of agents."""
 
-    def __init__(self, num_agents=7, num_nodes=10):
+    def __init__(
+        self, num_agents=7, num_nodes=10, avg_node_degree=None, graph=None, seed=None
+    ):
+        """
+        Create a new network wealth model.
+
+        Args:
+            num_agents: Number of agents.
+            num_nodes: Number of nodes of the random graph, at least num_agents.
+            avg_node_degree: Average degree of the random graph; by default,
+                every pair of nodes is linked with probability 0.5, which
+                makes large graphs dense.
+            graph: A CSRGraph or the path of an edge list file to use instead
+                of a random graph.
+            seed: Seed for the random number generators.
+        """
         self.num_agents = num_agents
-        self.num_nodes = num_nodes if num_nodes >= self.num_agents else self.num_agents
-        self.G = nx.erdos_renyi_graph(n=self.num_nodes, p=0.5)
-        self.grid = mesa.space.NetworkGrid(self.G)
+        num_nodes = num_nodes if num_nodes >= self.num_agents else self.num_agents
+        prob = 0.5 if avg_node_degree is None else avg_node_degree / num_nodes
+        self.graph = make_graph(graph, num_nodes, prob, np.random.default_rng(seed))
+        self.num_nodes = self.graph.num_nodes
+        self.grid = OccupancyNetworkGrid(self.graph)
         self.schedule = mesa.time.RandomActivation(self)
+        # number of agents at each wealth, kept up to date by the agents
+        self.wealth_histogram = WealthHistogram()
         self.datacollector = mesa.DataCollector(
             model_reporters={"Gini": compute_gini},
             agent_reporters={"Wealth": lambda _: _.wealth},
         )
 
-        list_of_random_nodes = self.random.sample(list(self.G), self.num_agents)
+        list_of_random_nodes = self.random.sample(
+            range(self.num_nodes), self.num_agents
+        )
 
         # Create agents
         for i in range(self.num_agents):
@@ -36,6 +59,11 @@ class BoltzmannWealthModelNetwork(mesa.Model):
         self.running = True
         self.datacollector.collect(self)
 
+    @property
+    def G(self):
+        """The graph as a networkx Graph, only built when first used."""
+        return self.graph.G
+
     def step(self):
         self.schedule.step()
         # collect data
@@ -51,21 +79,26 @@ class MoneyAgent(mesa.Agent):
 
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model)
+        self._wealth = None
         self.wealth = 1
 
+    @property
+    def wealth(self):
+        return self._wealth
+
+    @wealth.setter
+    def wealth(self, wealth):
+        self.model.wealth_histogram.move(self._wealth, wealth)
+        self._wealth = wealth
+
     def move(self):
-        possible_steps = [
-            node
-            for node in self.model.grid.get_neighbors(self.pos, include_center=False)
-            if self.model.grid.is_cell_empty(node)
-        ]
+        possible_steps = self.model.grid.get_empty_neighbors(self.pos)
         if len(possible_steps) > 0:
-            new_position = self.random.choice(possible_steps)
+            new_position = int(self.random.choice(possible_steps))
             self.model.grid.move_agent(self, new_position)
 
     def give_money(self):
-        neighbors_nodes = self.model.grid.get_neighbors(self.pos, include_center=False)
-        neighbors = self.model.grid.get_cell_list_contents(neighbors_nodes)
+        neighbors = self.model.grid.get_neighbor_agents(self.pos)
         if len(neighbors) > 0:
             other = self.random.choice(neighbors)
             other.wealth += 1
@@ -3,20 +3,32 @@ import mesa
 from .model import BoltzmannWealthModelNetwork
 
 
-def network_portrayal(G):
+class OccupancyNetworkModule(mesa.visualization.NetworkModule):
+    """
+    NetworkModule that passes the whole model to the portrayal method, as the
+    agents are kept in model.grid rather than in the attributes of model.G.
+    """
+
+    def render(self, model):
+        return self.portrayal_method(model)
+
+
+def network_portrayal(model):
     # The model ensures there is 0 or 1 agent per node
+    G = model.G
+    agents = [model.grid.get_node_agent(node_id) for node_id in G.nodes]
 
     portrayal = dict()
     portrayal["nodes"] = [
         {
             "id": node_id,
-            "size": 3 if agents else 1,
-            "color": "#CC0000" if not agents or agents[0].wealth == 0 else "#007959",
+            "size": 3 if agent else 1,
+            "color": "#CC0000" if not agent or agent.wealth == 0 else "#007959",
             "label": None
-            if not agents
-            else f"Agent:{agents[0].unique_id} Wealth:{agents[0].wealth}",
+            if not agent
+            else f"Agent:{agent.unique_id} Wealth:{agent.wealth}",
         }
-        for (node_id, agents) in G.nodes.data("agent")
+        for node_id, agent in zip(G.nodes, agents)
     ]
 
     portrayal["edges"] = [
@@ -27,7 +39,7 @@ def network_portrayal(G):
     return portrayal
 
 
-grid = mesa.visualization.NetworkModule(network_portrayal, 500, 500)
+grid = OccupancyNetworkModule(network_portrayal, 500, 500)
 chart = mesa.visualization.ChartModule(
     [{"Label": "Gini", "Color": "Black"}], data_collector_name="datacollector"
 )
@@ -0,0 +1,81 @@
+"""
+Network space with at most one agent per node, kept as arrays.
+"""
+
+import numpy as np
+
+
+class OccupancyNetworkGrid:
+    """
+    Places agents on the nodes of a CSRGraph, at most one agent per node.
+
+    Instead of NetworkGrid's list of agents in each networkx node attribute
+    dict, the agent on every node is kept in an occupancy array over the node
+    indices, holding the agent's index in the agents list or -1 for an empty
+    node. With the CSR neighbor arrays of the graph, the empty neighbors or
+    the agents on the neighbors of a node are found with a slice and a mask,
+    and nothing ever touches networkx, so the graph can have millions of
+    nodes.
+    """
+
+    def __init__(self, graph):
+        """
+        Create a new grid.
+
+        Args:
+            graph: The CSRGraph to place agents on.
+        """
+        self.graph = graph
+        self.occupant = np.full(graph.num_nodes, -1, dtype=np.int64)
+        self.agents = []
+        self._agent_index = {}
+
+    @property
+    def empty_mask(self):
+        """Boolean array of the empty nodes."""
+        return self.occupant < 0
+
+    def is_cell_empty(self, node_id):
+        """Returns a bool of the contents of a cell."""
+        return self.occupant[node_id] < 0
+
+    def get_neighbors(self, node_id):
+        """Return the neighbors of a node, as an array view."""
+        return self.graph.neighbors(node_id)
+
+    def get_empty_neighbors(self, node_id):
+        """Return the empty neighbors of a node, as an array."""
+        neighbors = self.graph.neighbors(node_id)
+        return neighbors[self.occupant[neighbors] < 0]
+
+    def get_neighbor_agents(self, node_id):
+        """Return the agents on the neighbors of a node, as a list."""
+        occupants = self.occupant[self.graph.neighbors(node_id)]
+        return [self.agents[index] for index in occupants[occupants >= 0].tolist()]
+
+    def get_node_agent(self, node_id):
+        """Return the agent on a node, or None if it is empty."""
+        index = self.occupant[node_id]
+        return self.agents[index] if index >= 0 else None
+
+    def place_agent(self, agent, node_id):
+        """Place an agent on an empty node, and set its pos variable."""
+        if self.occupant[node_id] >= 0:
+            raise ValueError(f"Node {node_id} is already occupied")
+        if agent not in self._agent_index:
+            self._agent_index[agent] = len(self.agents)
+            self.agents.append(agent)
+        self.occupant[node_id] = self._agent_index[agent]
+        agent.pos = node_id
+
+    def move_agent(self, agent, node_id):
+        """Move an agent from its current node to a new, empty node."""
+        if self.occupant[node_id] >= 0:
+            raise ValueError(f"Node {node_id} is already occupied")
+        self.occupant[agent.pos] = -1
+        self.place_agent(agent, node_id)
+
+    def remove_agent(self, agent):
+        """Remove the agent from the network and set its pos attribute to None."""
+        self.occupant[agent.pos] = -1
+        agent.pos = None
@@ -0,0 +1,73 @@
+"""
+Gini coefficient of the agents' wealth, from a histogram of wealth values.
+"""
+
+import numpy as np
+
+
+def gini(wealths):
+    """
+    Return the Gini coefficient of any wealth values, sorting them with NumPy.
+    """
+    x = np.sort(np.asarray(wealths, dtype=np.float64))
+    N = len(x)
+    B = np.dot(x, N - np.arange(N)) / (N * x.sum())
+    return 1 + (1 / N) - 2 * B
+
+
+class WealthHistogram:
+    """
+    Number of agents at each wealth, for wealth that is a small non-negative
+    integer, updated as agents gain and lose money.
+
+    The Gini coefficient then takes O(max wealth) time instead of sorting the
+    wealth of every agent. Once a wealth that is not a non-negative integer
+    is added, the histogram is no longer valid and gini() must be used.
+    """
+
+    def __init__(self, size=16):
+        self.counts = np.zeros(size, dtype=np.int64)
+        self.valid = True
+
+    @classmethod
+    def from_wealth(cls, wealth):
+        """Create the histogram of an array of non-negative integer wealth."""
+        histogram = cls()
+        histogram.counts = np.bincount(wealth).astype(np.int64)
+        return histogram
+
+    def add(self, wealth):
+        if not isinstance(wealth, (int, np.integer)) or wealth < 0:
+            self.valid = False
+            return
+        if wealth >= len(self.counts):
+            grown = np.zeros(max(2 * len(self.counts), wealth + 1), dtype=np.int64)
+            grown[: len(self.counts)] = self.counts
+            self.counts = grown
+        self.counts[wealth] += 1
+
+    def remove(self, wealth):
+        if self.valid:
+            self.counts[wealth] -= 1
+
+    def move(self, old, new):
+        """Move an agent from wealth old, None for a new agent, to wealth new."""
+        if old is not None:
+            self.remove(old)
+        self.add(new)
+
+    def gini(self):
+        """
+        Return the Gini coefficient of the wealth in the histogram, with the
+        same formula as gini(): all the agents of a wealth w take a block of
+        consecutive positions in the sorted wealth, so their terms are summed
+        at once.
+        """
+        counts = self.counts.astype(np.float64)
+        wealth = np.arange(len(counts))
+        N = counts.sum()
+        starts = np.cumsum(counts) - counts
+        # sum of N - i over the positions i of the block of each wealth
+        weights = counts * N - counts * (2 * starts + counts - 1) / 2
+        B = np.dot(wealth, weights) / (N * np.dot(wealth, counts))
+        return 1 + (1 / N) - 2 * B
@@ -0,0 +1,104 @@
+from collections import defaultdict
+
+import mesa
+
+
+class TileActivation(mesa.time.SimultaneousActivation):
+    """
+    Simultaneous activation that only steps the agents near recent changes.
+
+    The grid is cut into square tiles of tile_size x tile_size cells. After
+    each step, the tiles in which some agent changed its state are marked
+    dirty. The next step only steps and advances the agents in the dirty tiles
+    and in the ring of tiles around them (their halo); everywhere else nothing
+    changed last tick, so nothing can change in this one. A step therefore
+    costs in proportion to the activity on the grid rather than to its area.
+
+    This relies on an agent's next state depending only on its own state and
+    on the states of its direct neighbors, as for cellular automata on a square
+    or hexagonal grid, where all neighbors lie in the 3x3 block of tiles
+    around a cell's tile. Agents must be placed on model.grid before they are
+    added. Changes made to agents from outside the schedule after the first
+    step must be reported with mark_dirty().
+
+    Active agents are stepped in the order they were added, like
+    SimultaneousActivation does, so both schedules give the same results.
+    """
+
+    def __init__(self, model, tile_size=8, state_attribute="state"):
+        """
+        Create a new tile activation.
+
+        Args:
+            model: Model object associated with the schedule.
+            tile_size: Width and height of a tile, in cells.
+            state_attribute: Name of the agent attribute holding its state.
+        """
+        super().__init__(model)
+        self.tile_size = tile_size
+        self.state_attribute = state_attribute
+        self.tiles = defaultdict(dict)
+        self._order = {}
+        # every tile starts out dirty, so the first step covers all agents
+        self.dirty = None
+        self.active_agents = 0
+
+    def add(self, agent):
+        super().add(agent)
+        self._order[agent.unique_id] = len(self._order)
+        self.tiles[self.tile_of(agent.pos)][agent.unique_id] = agent
+
+    def remove(self, agent):
+        super().remove(agent)
+        del self.tiles[self.tile_of(agent.pos)][agent.unique_id]
+        self.mark_dirty(agent.pos)
+
+    def tile_of(self, pos):
+        x, y = pos
+        return x // self.tile_size, y // self.tile_size
+
+    def mark_dirty(self, pos):
+        """Have the cells around pos computed again in the next step."""
+        if self.dirty is not None:
+            self.dirty.add(self.tile_of(pos))
+
+    def active_tiles(self):
+        """Return the dirty tiles and their halos."""
+        if self.dirty is None:
+            return set(self.tiles)
+        grid = self.model.grid
+        columns = -(-grid.width // self.tile_size)
+        rows = -(-grid.height // self.tile_size)
+        active = set()
+        for tx, ty in self.dirty:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    x, y = tx + dx, ty + dy
+                    if grid.torus:
+                        active.add((x % columns, y % rows))
+                    elif 0 <= x < columns and 0 <= y < rows:
+                        active.add((x, y))
+        return active
+
+    def step(self):
+        """Step the agents of the active tiles, then advance them."""
+        agents = [
+            agent
+            for tile in self.active_tiles()
+            for agent in self.tiles.get(tile, {}).values()
+        ]
+        agents.sort(key=lambda agent: self._order[agent.unique_id])
+        self.active_agents = len(agents)
+        for agent in agents:
+            agent.step()
+        attribute = self.state_attribute
+        before = [getattr(agent, attribute) for agent in agents]
+        for agent in agents:
+            agent.advance()
+        self.dirty = {
+            self.tile_of(agent.pos)
+            for agent, state in zip(agents, before)
+            if getattr(agent, attribute) != state
+        }
+        self.steps += 1
+        self.time += 1
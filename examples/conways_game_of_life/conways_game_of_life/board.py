@@ -0,0 +1,239 @@
+import numpy as np
+
+from .cell import Cell
+from .rle import read_rle, write_rle
+
+
+class Board:
+    """
+    The whole Game of Life as a 2-dimensional uint8 numpy array, indexed
+    [x, y] like the grid, holding Cell.ALIVE or Cell.DEAD. Edges wrap around.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.cells = np.zeros((width, height), dtype=np.uint8)
+
+    def state(self, x, y):
+        """Return the state of the cell at (x, y)."""
+        return int(self.cells[x, y])
+
+    def load_rle(self, text, x=0, y=0):
+        """Place an RLE pattern with its top left corner at (x, y)."""
+        pattern = read_rle(text)
+        cells = self.cells
+        xs = np.arange(x, x + pattern.shape[0]) % self.width
+        ys = np.arange(y, y + pattern.shape[1]) % self.height
+        cells[np.ix_(xs, ys)] = pattern
+        self.cells = cells
+
+    def fill_random(self, density, rng):
+        """
+        Make every cell alive with probability density, drawing from the
+        NumPy generator rng in grid order.
+        """
+        self.cells = (rng.random((self.width, self.height)) < density).astype(np.uint8)
+
+    def to_rle(self):
+        """Return the whole board as an RLE pattern."""
+        return write_rle(self.cells)
+
+    def live_neighbors(self):
+        """
+        Return the number of live neighbors of every cell.
+
+        The board is padded by one cell on each side with the cells from the
+        opposite edge, and the eight shifted views of the padded board are
+        added up.
+        """
+        padded = np.pad(self.cells, 1, mode="wrap")
+        width, height = self.width, self.height
+        count = np.zeros((width, height), dtype=np.uint8)
+        for dx in range(3):
+            for dy in range(3):
+                if dx != 1 or dy != 1:
+                    count += padded[dx : dx + width, dy : dy + height]
+        return count
+
+    def step(self):
+        """
+        Advance every cell by one tick: a dead cell with exactly three live
+        neighbors is born, a live cell with two or three survives (B3/S23).
+        """
+        count = self.live_neighbors()
+        alive = (count == 3) | ((self.cells == Cell.ALIVE) & (count == 2))
+        self.cells = alive.astype(np.uint8)
+
+
+class PackedBoard(Board):
+    """
+    Game of Life board storing 64 cells per uint64 word, for very large boards.
+
+    Each column x of the board is packed along y: bit k of word w holds the
+    cell (x, 64 * w + k). Memory is one bit per cell instead of one byte, and
+    a tick is computed 64 cells at a time with bitwise full-adder logic.
+
+    The cells property unpacks to, and packs from, a uint8 array like the one
+    of Board, which is convenient but costs a full pass over the board.
+    """
+
+    def __init__(self, width, height):
+        self.words_per_column = -(-height // 64)
+        # bits of the last word of a column that lie on the board
+        self.last_word_mask = np.uint64((1 << (height - 1) % 64 + 1) - 1)
+        self.top_bit = np.uint64((height - 1) % 64)
+        # set the words directly, without the uint8 board Board.__init__ makes
+        self.width = width
+        self.height = height
+        self.words = np.zeros((width, self.words_per_column), dtype=np.uint64)
+
+    @property
+    def cells(self):
+        return self.unpack(self.words)
+
+    @cells.setter
+    def cells(self, cells):
+        self.words = self.pack(cells)
+
+    def unpack(self, words):
+        """Return the columns of cells held in some rows of words, as uint8."""
+        bits = np.unpackbits(
+            words.astype("<u8").view(np.uint8), axis=1, bitorder="little"
+        )
+        return bits[:, : self.height]
+
+    def pack(self, cells):
+        """Return the words holding some columns of cells."""
+        packed = np.packbits(cells, axis=1, bitorder="little")
+        padded = np.zeros((len(cells), 8 * self.words_per_column), dtype=np.uint8)
+        padded[:, : packed.shape[1]] = packed
+        return padded.view("<u8").astype(np.uint64)
+
+    def load_rle(self, text, x=0, y=0):
+        """
+        Place an RLE pattern with its top left corner at (x, y), unpacking
+        only the columns the pattern covers.
+        """
+        pattern = read_rle(text)
+        xs = np.arange(x, x + pattern.shape[0]) % self.width
+        ys = np.arange(y, y + pattern.shape[1]) % self.height
+        columns = self.unpack(self.words[xs])
+        columns[:, ys] = pattern
+        self.words[xs] = self.pack(columns)
+
+    def fill_random(self, density, rng):
+        """
+        Make every cell alive with probability density, drawing from the
+        NumPy generator rng in grid order, so that the board is the same as
+        Board.fill_random() with the same generator. The draws are made and
+        packed a block of columns at a time, without an unpacked board.
+        """
+        block = max(1, 2**20 // self.height)
+        for x in range(0, self.width, block):
+            alive = rng.random((min(block, self.width - x), self.height)) < density
+            self.words[x : x + block] = self.pack(alive)
+
+    def state(self, x, y):
+        word, bit = divmod(y, 64)
+        return int(self.words[x, word] >> np.uint64(bit) & np.uint64(1))
+
+    def count_alive(self):
+        """Return the number of live cells."""
+        return int(_BITS_SET[self.words.view(np.uint8)].sum())
+
+    def shift_up(self, words):
+        """Columns with cell y replaced by cell y - 1, wrapping around."""
+        one = np.uint64(1)
+        shifted = words << one
+        shifted[:, 1:] |= words[:, :-1] >> np.uint64(63)
+        shifted[:, 0] |= words[:, -1] >> self.top_bit & one
+        shifted[:, -1] &= self.last_word_mask
+        return shifted
+
+    def shift_down(self, words):
+        """Columns with cell y replaced by cell y + 1, wrapping around."""
+        one = np.uint64(1)
+        shifted = words >> one
+        shifted[:, :-1] |= (words[:, 1:] & one) << np.uint64(63)
+        shifted[:, -1] &= self.last_word_mask >> one
+        shifted[:, -1] |= (words[:, 0] & one) << self.top_bit
+        return shifted
+
+    def step(self):
+        """
+        Advance every cell by one tick (B3/S23).
+
+        The eight neighbor bit planes are the board shifted by one cell in
+        each direction. They are added up with full adders into a ones, twos
+        and fours-or-more bit per cell, from which the rule follows directly.
+        """
+        words = self.words
+        up, down = self.shift_up(words), self.shift_down(words)
+        left = [np.roll(plane, 1, axis=0) for plane in (up, words, down)]
+        right = [np.roll(plane, -1, axis=0) for plane in (up, words, down)]
+
+        ones_a, twos_a = _full_add(*left)
+        ones_b, twos_b = _full_add(*right)
+        ones_c, twos_c = up ^ down, up & down
+        ones, twos_d = _full_add(ones_a, ones_b, ones_c)
+        twos_e, fours_a = _full_add(twos_a, twos_b, twos_c)
+        twos = twos_e ^ twos_d
+        fours = fours_a | (twos_e & twos_d)
+        # exactly two or three live neighbors, and three or alive already
+        self.words = twos & ~fours & (ones | words)
+
+
+def _full_add(a, b, c):
+    """Add three bit planes, returning the sum and carry bit planes."""
+    half = a ^ b
+    return half ^ c, (a & b) | (half & c)
+
+
+# number of bits set in every byte value
+_BITS_SET = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+class BoardCell:
+    """
+    Read-only view of one cell of a Board, with the attributes of a Cell that
+    the portrayal needs. Views are only created when asked for, e.g. by the
+    visualization.
+    """
+
+    DEAD = Cell.DEAD
+    ALIVE = Cell.ALIVE
+
+    def __init__(self, board, pos):
+        self.board = board
+        self.pos = pos
+        self.x, self.y = pos
+
+    @property
+    def state(self):
+        return self.board.state(self.x, self.y)
+
+    @property
+    def isAlive(self):
+        return self.state == self.ALIVE
+
+
+class BoardGrid:
+    """
+    Stands in for the model's grid when the cells live in a Board, handing out
+    BoardCell views for the cells that are asked for.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.width = board.width
+        self.height = board.height
+        self.torus = True
+
+    def get_cell_list_contents(self, cell_list):
+        if isinstance(cell_list, tuple) and len(cell_list) == 2:
+            cell_list = [cell_list]
+        return [BoardCell(self.board, pos) for pos in cell_list]
+
+    def __getitem__(self, x):
+        return [BoardCell(self.board, (x, y)) for y in range(self.height)]
@@ -1,6 +1,10 @@
 import mesa
+import numpy as np
 
+from .activity import TileActivation
+from .board import Board, BoardGrid, PackedBoard
 from .cell import Cell
+from .rle import read_rle
 
 
 class ConwaysGameOfLife(mesa.Model):
@@ -9,10 +13,69 @@ class ConwaysGameOfLife(mesa.Model):
     Game of Life.
     """
 
-    def __init__(self, width=50, height=50):
+    # "agents" steps one Cell agent per grid square; "numpy" keeps the whole
+    # board in a numpy array and steps it with array operations; "packed"
+    # stores 64 cells per machine word, for very large boards.
+    backends = ("agents", "numpy", "packed")
+
+    def __init__(
+        self,
+        width=50,
+        height=50,
+        backend="agents",
+        pattern=None,
+        tile_size=None,
+        exact_seeding=False,
+        seed=None,
+    ):
         """
         Create a new playing area of (width, height) cells.
+
+        Args:
+            width, height: Size of the playing area.
+            backend: "agents", "numpy" or "packed".
+            pattern: Optional RLE pattern to start from, placed in the middle
+                     of the playing area, instead of a random configuration.
+            tile_size: With the agents backend, only step the cells in tiles
+                       of this size that changed last tick and the tiles
+                       around them, see TileActivation.
+            exact_seeding: The agents backend draws the random configuration
+                           one cell at a time from the model's random
+                           generator, while the numpy and packed backends
+                           draw the whole board at once with a NumPy
+                           generator, so that the two agree with each other
+                           but not with the agents backend. With
+                           exact_seeding=True they draw like the agents
+                           backend instead, which is slow on large boards but
+                           gives every backend the same board at every tick
+                           for the same seed.
+            seed: Seed for the random number generators.
         """
+        if backend not in self.backends:
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
+
+        if backend in ("numpy", "packed"):
+            # The schedule holds no agents; it only keeps the step count.
+            self.schedule = mesa.time.BaseScheduler(self)
+            self.board = (Board if backend == "numpy" else PackedBoard)(width, height)
+            if pattern is not None:
+                self.load_pattern(self.board, pattern)
+            elif exact_seeding:
+                self.board.cells = self.draw_cells(width, height)
+            else:
+                self.board.fill_random(0.1, np.random.default_rng(seed))
+            # Cells are only materialized when the visualization asks.
+            self.grid = BoardGrid(self.board)
+            self.running = True
+            return
+
+        if pattern is not None:
+            start = Board(width, height)
+            self.load_pattern(start, pattern)
+            initial = start.cells
+        else:
+            initial = self.draw_cells(width, height)
 
         # Set up the grid and schedule.
 
@@ -20,7 +83,10 @@ class ConwaysGameOfLife(mesa.Model):
         # computing their next state simultaneously.  This needs to
         # be done because each cell's next state depends on the current
         # state of all its neighbors -- before they've changed.
-        self.schedule = mesa.time.SimultaneousActivation(self)
+        if tile_size is None:
+            self.schedule = mesa.time.SimultaneousActivation(self)
+        else:
+            self.schedule = TileActivation(self, tile_size)
 
         # Use a simple grid, where edges wrap around.
         self.grid = mesa.space.SingleGrid(width, height, torus=True)
@@ -29,15 +95,35 @@ class ConwaysGameOfLife(mesa.Model):
         # ALIVE and some to DEAD.
         for contents, x, y in self.grid.coord_iter():
             cell = Cell((x, y), self)
-            if self.random.random() < 0.1:
-                cell.state = cell.ALIVE
+            cell.state = int(initial[x, y])
             self.grid.place_agent(cell, (x, y))
             self.schedule.add(cell)
 
         self.running = True
 
+    @staticmethod
+    def load_pattern(board, pattern):
+        """Place an RLE pattern in the middle of a board."""
+        pattern_width, pattern_height = read_rle(pattern).shape
+        board.load_rle(
+            pattern,
+            (board.width - pattern_width) // 2,
+            (board.height - pattern_height) // 2,
+        )
+
+    def draw_cells(self, width, height):
+        """Draw the initial states one at a time, in grid order."""
+        initial = np.zeros((width, height), dtype=np.uint8)
+        for x in range(width):
+            for y in range(height):
+                if self.random.random() < 0.1:
+                    initial[x, y] = Cell.ALIVE
+        return initial
+
     def step(self):
         """
         Have the scheduler advance each cell by one step
         """
+        if self.backend != "agents":
+            self.board.step()
         self.schedule.step()
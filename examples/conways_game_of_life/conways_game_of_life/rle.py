@@ -0,0 +1,92 @@
+"""
+Reading and writing Game of Life patterns in the run length encoded (RLE)
+format, see https://conwaylife.com/wiki/Run_Length_Encoded
+
+Patterns are uint8 arrays indexed [x, y] like the Board, where x is the column
+and y the line of the pattern, counted from the first line.
+"""
+
+import re
+
+import numpy as np
+
+from .cell import Cell
+
+_TOKEN = re.compile(r"(\d*)([a-zA-Z$!])")
+
+
+def read_rle(text):
+    """
+    Parse an RLE pattern and return it as a uint8 array of cell states.
+
+    Comment lines (starting with #) are skipped. Cells in states other than
+    dead (b) and alive (o) are read as alive.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line and not line.startswith("#")]
+    if not lines or not lines[0].startswith("x"):
+        raise ValueError("RLE pattern is missing its header line")
+    header = {
+        key.strip(): value.strip()
+        for key, value in (item.split("=") for item in lines[0].split(","))
+    }
+    width, height = int(header["x"]), int(header["y"])
+    cells = np.zeros((width, height), dtype=np.uint8)
+
+    x = y = 0
+    for count, tag in _TOKEN.findall("".join(lines[1:])):
+        count = int(count) if count else 1
+        if tag == "!":
+            break
+        if tag == "$":
+            x = 0
+            y += count
+            continue
+        if tag != "b":
+            cells[x : x + count, y] = Cell.ALIVE
+        x += count
+    return cells
+
+
+def write_rle(cells, rule="B3/S23", line_length=70):
+    """
+    Encode a uint8 array of cell states as an RLE pattern.
+    """
+    width, height = cells.shape
+    runs = []
+    for y in range(height):
+        line = cells[:, y]
+        (alive,) = np.nonzero(line)
+        if not len(alive):
+            runs.append((1, "$"))
+            continue
+        # run boundaries, up to the last live cell of the line
+        line = line[: alive[-1] + 1]
+        (edges,) = np.nonzero(np.diff(line))
+        starts = np.r_[0, edges + 1]
+        stops = np.r_[edges + 1, len(line)]
+        for start, stop in zip(starts, stops):
+            runs.append((stop - start, "o" if line[start] else "b"))
+        runs.append((1, "$"))
+    # trailing empty lines can be dropped, and the last line ends with "!"
+    while runs and runs[-1][1] == "$":
+        runs.pop()
+
+    merged = []
+    for count, tag in runs:
+        if merged and merged[-1][1] == tag == "$":
+            merged[-1][0] += count
+        else:
+            merged.append([count, tag])
+    items = [f"{count if count > 1 else ''}{tag}" for count, tag in merged]
+    items.append("!")
+
+    body = []
+    line = ""
+    for item in items:
+        if len(line) + len(item) > line_length:
+            body.append(line)
+            line = ""
+        line += item
+    body.append(line)
+    return "\n".join([f"x = {width}, y = {height}, rule = {rule}", *body]) + "\n"
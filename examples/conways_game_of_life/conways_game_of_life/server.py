@@ -7,6 +7,14 @@ from .model import ConwaysGameOfLife
 # Make a world that is 50x50, on a 250x250 display.
 canvas_element = mesa.visualization.CanvasGrid(portrayCell, 50, 50, 250, 250)
 
+model_params = {
+    "height": 50,
+    "width": 50,
+    "backend": mesa.visualization.Choice(
+        "Backend", value="agents", choices=list(ConwaysGameOfLife.backends)
+    ),
+}
+
 server = mesa.visualization.ModularServer(
-    ConwaysGameOfLife, [canvas_element], "Game of Life", {"height": 50, "width": 50}
+    ConwaysGameOfLife, [canvas_element], "Game of Life", model_params
 )
@@ -64,17 +64,37 @@ class Citizen(mesa.Agent):
         self.threshold = threshold
         self.condition = "Quiescent"
         self.vision = vision
-        self.jail_sentence = 0
+        # step at which the citizen is released from jail, see jail_sentence
+        self.release_step = 0
         self.grievance = self.hardship * (1 - self.regime_legitimacy)
         self.arrest_probability = None
 
+    @property
+    def jail_sentence(self):
+        """
+        Number of steps left in jail, 0 when free. Jailed citizens are kept in
+        the model's jail wheel rather than on the schedule, see
+        EpsteinCivilViolence.jail().
+        """
+        return max(0, self.release_step - self.model.schedule.steps)
+
     def step(self):
+        """
+        Decide whether to activate, then move if applicable. With vision
+        counts, take myself out of the model's presence arrays while I may
+        change or move.
+        """
+        if self.model.vision_counts:
+            self.model.count_presence(self, -1)
+            self.act()
+            self.model.count_presence(self, 1)
+        else:
+            self.act()
+
+    def act(self):
         """
         Decide whether to activate, then move if applicable.
         """
-        if self.jail_sentence:
-            self.jail_sentence -= 1
-            return  # no other changes or movements if agent is in jail.
         self.update_neighbors()
         self.update_estimated_arrest_probability()
         net_risk = self.risk_aversion * self.arrest_probability
@@ -98,7 +118,8 @@ class Citizen(mesa.Agent):
         self.neighborhood = self.model.grid.get_neighborhood(
             self.pos, moore=False, radius=1
         )
-        self.neighbors = self.model.grid.get_cell_list_contents(self.neighborhood)
+        if not self.model.vision_counts:
+            self.neighbors = self.model.grid.get_cell_list_contents(self.neighborhood)
         self.empty_neighbors = [
             c for c in self.neighborhood if self.model.grid.is_cell_empty(c)
         ]
@@ -108,15 +129,24 @@ class Citizen(mesa.Agent):
         Based on the ratio of cops to actives in my neighborhood, estimate the
         p(Arrest | I go active).
         """
-        cops_in_vision = len([c for c in self.neighbors if c.breed == "cop"])
-        actives_in_vision = 1.0  # citizen counts herself
-        for c in self.neighbors:
-            if (
-                c.breed == "citizen"
-                and c.condition == "Active"
-                and c.jail_sentence == 0
-            ):
-                actives_in_vision += 1
+        if self.model.vision_counts:
+            # counts over my vision at the start of the step, which include
+            # myself if I was active
+            x, y = self.pos
+            cops_in_vision = self.model.cops_in_vision[x][y]
+            actives_in_vision = 1.0 + self.model.actives_in_citizen_vision[x][y]
+            if self.condition == "Active":
+                actives_in_vision -= 1
+        else:
+            cops_in_vision = len([c for c in self.neighbors if c.breed == "cop"])
+            actives_in_vision = 1.0  # citizen counts herself
+            for c in self.neighbors:
+                if (
+                    c.breed == "citizen"
+                    and c.condition == "Active"
+                    and c.jail_sentence == 0
+                ):
+                    actives_in_vision += 1
         self.arrest_probability = 1 - math.exp(
             -1 * self.model.arrest_prob_constant * (cops_in_vision / actives_in_vision)
         )
@@ -155,21 +185,29 @@ class Cop(mesa.Agent):
         applicable.
         """
         self.update_neighbors()
-        active_neighbors = []
-        for agent in self.neighbors:
-            if (
-                agent.breed == "citizen"
-                and agent.condition == "Active"
-                and agent.jail_sentence == 0
-            ):
-                active_neighbors.append(agent)
+        if self.model.vision_counts:
+            active_neighbors = self.model.actives_in_vision(self.pos, self.vision)
+        else:
+            active_neighbors = []
+            for agent in self.neighbors:
+                if (
+                    agent.breed == "citizen"
+                    and agent.condition == "Active"
+                    and agent.jail_sentence == 0
+                ):
+                    active_neighbors.append(agent)
         if active_neighbors:
             arrestee = self.random.choice(active_neighbors)
             sentence = self.random.randint(0, self.model.max_jail_term)
-            arrestee.jail_sentence = sentence
+            self.model.jail(arrestee, sentence)
         if self.model.movement and self.empty_neighbors:
             new_pos = self.random.choice(self.empty_neighbors)
-            self.model.grid.move_agent(self, new_pos)
+            if self.model.vision_counts:
+                self.model.count_presence(self, -1)
+                self.model.grid.move_agent(self, new_pos)
+                self.model.count_presence(self, 1)
+            else:
+                self.model.grid.move_agent(self, new_pos)
 
     def update_neighbors(self):
         """
@@ -178,7 +216,8 @@ class Cop(mesa.Agent):
         self.neighborhood = self.model.grid.get_neighborhood(
             self.pos, moore=False, radius=1
         )
-        self.neighbors = self.model.grid.get_cell_list_contents(self.neighborhood)
+        if not self.model.vision_counts:
+            self.neighbors = self.model.grid.get_cell_list_contents(self.neighborhood)
         self.empty_neighbors = [
             c for c in self.neighborhood if self.model.grid.is_cell_empty(c)
         ]
@@ -0,0 +1,44 @@
+"""
+Timer wheel for jailed citizens.
+"""
+
+
+class JailWheel:
+    """
+    The jailed citizens, bucketed by the step they are released at.
+
+    Buckets form a ring with one bucket per possible time left in jail, so
+    jailing and releasing take constant time per citizen, and nobody has to
+    be stepped just to count down their sentence.
+    """
+
+    def __init__(self, max_jail_term):
+        """
+        Create an empty wheel.
+
+        Args:
+            max_jail_term: The longest sentence; citizens are released at most
+                max_jail_term + 1 steps after the step they are jailed in.
+        """
+        self.buckets = [[] for _ in range(max_jail_term + 2)]
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for bucket in self.buckets:
+            yield from bucket
+
+    def add(self, citizen, release_step):
+        """Jail the citizen until release_step."""
+        self.buckets[release_step % len(self.buckets)].append(citizen)
+        self.size += 1
+
+    def release(self, step):
+        """Remove and return the citizens released at the given step."""
+        index = step % len(self.buckets)
+        released = self.buckets[index]
+        self.buckets[index] = []
+        self.size -= len(released)
+        return released
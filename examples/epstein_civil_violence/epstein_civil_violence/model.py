@@ -1,6 +1,48 @@
 import mesa
+import numpy as np
 
 from .agent import Cop, Citizen
+from .jail import JailWheel
+from .recorder import AgentRecorder, Column
+from .space import EmptyIndexedSingleGrid
+
+
+def vision_offsets(radius, size):
+    """
+    Return the offsets, along an axis of the given size, of the cells up to
+    radius away on a torus, each cell once. Like grid.get_neighborhood, a
+    radius reaching around the torus covers the whole axis, starting from
+    -min(radius, size // 2).
+    """
+    before = min(radius, size // 2)
+    return np.arange(-before, min(2 * radius + 1, size) - before)
+
+
+def box_sum(counts, radius):
+    """
+    Sum counts over the (2 * radius + 1) square around every cell of a torus.
+
+    The array is padded with radius cells from the opposite edges, and every
+    square is read off the summed-area table of the padded array with four
+    lookups, so the cost does not depend on the radius. Along an axis shorter
+    than the square, the whole axis is summed once, each cell counted once.
+    """
+    width, height = counts.shape
+    x_offsets, y_offsets = vision_offsets(radius, width), vision_offsets(radius, height)
+    x_side, y_side = len(x_offsets), len(y_offsets)
+    padded = np.pad(
+        counts,
+        ((-x_offsets[0], x_offsets[-1]), (-y_offsets[0], y_offsets[-1])),
+        mode="wrap",
+    )
+    table = np.zeros((width + x_side, height + y_side), dtype=np.int64)
+    table[1:, 1:] = padded.cumsum(axis=0).cumsum(axis=1)
+    return (
+        table[x_side:, y_side:]
+        - table[:-x_side, y_side:]
+        - table[x_side:, :-y_side]
+        + table[:-x_side, :-y_side]
+    )
 
 
 class EpsteinCivilViolence(mesa.Model):
@@ -27,6 +69,13 @@ class EpsteinCivilViolence(mesa.Model):
         movement: binary, whether agents try to move at step end
         max_iters: model may not have a natural stopping point, so we set a
             max.
+        agent_record_interval: record the agent variables every this many
+            steps, see agent_recorder.
+        vision_counts: if True, citizens count cops and actives, and cops look
+            for actives, within the square of cells up to citizen_vision or
+            cop_vision away, rather than in the four adjacent cells. Counts
+            are read off arrays computed for all cells at once at the start of
+            each step.
     """
 
     def __init__(
@@ -43,6 +92,8 @@ class EpsteinCivilViolence(mesa.Model):
         arrest_prob_constant=2.3,
         movement=True,
         max_iters=1000,
+        vision_counts=False,
+        agent_record_interval=1,
     ):
         super().__init__()
         self.width = width
@@ -57,25 +108,18 @@ class EpsteinCivilViolence(mesa.Model):
         self.arrest_prob_constant = arrest_prob_constant
         self.movement = movement
         self.max_iters = max_iters
+        self.vision_counts = vision_counts
         self.iteration = 0
         self.schedule = mesa.time.RandomActivation(self)
-        self.grid = mesa.space.SingleGrid(width, height, torus=True)
+        # jailed citizens leave the schedule until they are released
+        self.jail_wheel = JailWheel(max_jail_term)
+        self.grid = EmptyIndexedSingleGrid(width, height, torus=True)
         model_reporters = {
             "Quiescent": lambda m: self.count_type_citizens(m, "Quiescent"),
             "Active": lambda m: self.count_type_citizens(m, "Active"),
             "Jailed": self.count_jailed,
         }
-        agent_reporters = {
-            "x": lambda a: a.pos[0],
-            "y": lambda a: a.pos[1],
-            "breed": lambda a: a.breed,
-            "jail_sentence": lambda a: getattr(a, "jail_sentence", None),
-            "condition": lambda a: getattr(a, "condition", None),
-            "arrest_probability": lambda a: getattr(a, "arrest_probability", None),
-        }
-        self.datacollector = mesa.DataCollector(
-            model_reporters=model_reporters, agent_reporters=agent_reporters
-        )
+        self.datacollector = mesa.DataCollector(model_reporters=model_reporters)
         unique_id = 0
         if self.cop_density + self.citizen_density > 1:
             raise ValueError("Cop density + citizen density must be less than 1")
@@ -83,7 +127,7 @@ class EpsteinCivilViolence(mesa.Model):
             if self.random.random() < self.cop_density:
                 cop = Cop(unique_id, self, (x, y), vision=self.cop_vision)
                 unique_id += 1
-                self.grid[x][y] = cop
+                self.grid.place_agent(cop, (x, y))
                 self.schedule.add(cop)
             elif self.random.random() < (self.cop_density + self.citizen_density):
                 citizen = Citizen(
@@ -97,19 +141,101 @@ class EpsteinCivilViolence(mesa.Model):
                     vision=self.citizen_vision,
                 )
                 unique_id += 1
-                self.grid[x][y] = citizen
+                self.grid.place_agent(citizen, (x, y))
                 self.schedule.add(citizen)
 
+        if self.vision_counts:
+            # cops and active citizens not in jail, per cell
+            self.cop_presence = np.zeros((width, height), dtype=np.int64)
+            self.active_presence = np.zeros((width, height), dtype=np.int64)
+            for agent in self.schedule.agents:
+                self.count_presence(agent, 1)
+
+        # Agent variables go into typed arrays rather than the datacollector;
+        # see agent_recorder.get_agent_vars_dataframe().
+        self.agent_recorder = AgentRecorder(
+            self.schedule.agents,
+            {
+                "x": Column(lambda a: a.pos[0], np.int16),
+                "y": Column(lambda a: a.pos[1], np.int16),
+                "breed": Column(lambda a: a.breed, categories=["citizen", "cop"]),
+                "jail_sentence": Column(
+                    lambda a: getattr(a, "jail_sentence", None), np.int32
+                ),
+                "condition": Column(
+                    lambda a: getattr(a, "condition", None),
+                    categories=["Quiescent", "Active"],
+                ),
+                "arrest_probability": Column(
+                    lambda a: getattr(a, "arrest_probability", None), np.float32
+                ),
+            },
+            interval=agent_record_interval,
+            capacity=max_iters // agent_record_interval + 2,
+        )
+
         self.running = True
         self.datacollector.collect(self)
+        self.agent_recorder.collect(self)
+
+    def count_presence(self, agent, change):
+        """
+        Add change to the cell of the agent in the presence arrays, if it is a
+        cop or an active citizen out of jail. Agents call this with -1 before
+        they move or change, and with 1 afterwards.
+        """
+        if agent.breed == "cop":
+            self.cop_presence[agent.pos] += change
+        elif agent.condition == "Active" and not agent.jail_sentence:
+            self.active_presence[agent.pos] += change
+
+    def jail(self, citizen, sentence):
+        """
+        Jail the citizen for sentence steps: take them off the schedule and
+        into the jail wheel, from which they return to the schedule at the
+        end of their last step in jail.
+        """
+        if not sentence:
+            return
+        if self.vision_counts:
+            self.count_presence(citizen, -1)
+        citizen.release_step = self.schedule.steps + sentence + 1
+        self.schedule.remove(citizen)
+        self.jail_wheel.add(citizen, citizen.release_step)
+
+    def release(self):
+        """Return the citizens whose sentence has ended to the schedule."""
+        for citizen in self.jail_wheel.release(self.schedule.steps):
+            self.schedule.add(citizen)
+            if self.vision_counts:
+                self.count_presence(citizen, 1)
+
+    def actives_in_vision(self, pos, radius):
+        """Return the active citizens out of jail up to radius cells from pos."""
+        x, y = pos
+        xs = (x + vision_offsets(radius, self.width)) % self.width
+        ys = (y + vision_offsets(radius, self.height)) % self.height
+        found_x, found_y = np.nonzero(self.active_presence[np.ix_(xs, ys)])
+        cells = zip(xs[found_x].tolist(), ys[found_y].tolist())
+        return [self.grid[x][y] for x, y in cells]
 
     def step(self):
         """
         Advance the model by one step and collect data.
         """
+        if self.vision_counts:
+            # nested lists, which are faster to index one cell at a time
+            self.cops_in_vision = box_sum(
+                self.cop_presence, self.citizen_vision
+            ).tolist()
+            self.actives_in_citizen_vision = box_sum(
+                self.active_presence, self.citizen_vision
+            ).tolist()
         self.schedule.step()
+        self.release()
         # collect data
         self.datacollector.collect(self)
+        self.agent_recorder.collect(self)
         self.iteration += 1
         if self.iteration > self.max_iters:
             self.running = False
@@ -123,10 +249,12 @@ class EpsteinCivilViolence(mesa.Model):
         for agent in model.schedule.agents:
             if agent.breed == "cop":
                 continue
-            if exclude_jailed and agent.jail_sentence:
-                continue
             if agent.condition == condition:
                 count += 1
+        if not exclude_jailed:
+            for agent in model.jail_wheel:
+                if agent.condition == condition:
+                    count += 1
         return count
 
     @staticmethod
@@ -134,8 +262,4 @@ class EpsteinCivilViolence(mesa.Model):
         """
         Helper method to count jailed agents.
         """
-        count = 0
-        for agent in model.schedule.agents:
-            if agent.breed == "citizen" and agent.jail_sentence:
-                count += 1
-        return count
+        return len(model.jail_wheel)
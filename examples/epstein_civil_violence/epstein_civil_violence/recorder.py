@@ -0,0 +1,126 @@
+"""
+Columnar recording of agent variables.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class Column:
+    """
+    How to record one agent variable.
+
+    Args:
+        get: Function of an agent returning the value to record, or None if
+            the agent has no such value.
+        dtype: NumPy dtype to store the values as. Missing values are stored
+            as NaN for floats and as the smallest value of the dtype for
+            integers.
+        categories: If given, the possible values of a categorical variable,
+            which is stored as int8 codes into this list, with -1 for missing
+            values; dtype is ignored.
+    """
+
+    def __init__(self, get, dtype=np.float64, categories=None):
+        self.get = get
+        self.categories = categories
+        if categories is not None:
+            self.dtype = np.dtype(np.int8)
+            self.codes = {category: code for code, category in enumerate(categories)}
+            self.missing = -1
+        else:
+            self.dtype = np.dtype(dtype)
+            self.missing = (
+                np.iinfo(self.dtype).min if self.dtype.kind in "iu" else np.nan
+            )
+
+    def encode(self, agents):
+        """Return the values of the agents, encoded for storage."""
+        values = [self.get(agent) for agent in agents]
+        if self.categories is not None:
+            return [self.codes.get(value, -1) for value in values]
+        missing = self.missing
+        return [missing if value is None else value for value in values]
+
+    def decode(self, stored):
+        """Return a pandas array of the stored values."""
+        if self.categories is not None:
+            return pd.Categorical.from_codes(stored, categories=self.categories)
+        if self.dtype.kind in "iu" and (stored == self.missing).any():
+            # pandas' nullable integer types are named e.g. "Int16", "UInt8"
+            prefix = "Int" if self.dtype.kind == "i" else "UInt"
+            values = pd.array(stored, dtype=f"{prefix}{8 * self.dtype.itemsize}")
+            values[stored == self.missing] = pd.NA
+            return values
+        return stored
+
+
+class AgentRecorder:
+    """
+    Records agent variables into preallocated typed NumPy arrays, one array
+    per variable with a row per recorded step and a column per agent.
+
+    Compared to a DataCollector's agent reporters, which keep a Python tuple
+    per agent and step, this takes a few bytes per value, which is what makes
+    long runs with agent-level history fit in memory. The set of agents is
+    fixed when the recorder is created.
+    """
+
+    def __init__(self, agents, columns, interval=1, capacity=64):
+        """
+        Create a new recorder.
+
+        Args:
+            agents: The agents to record, in the order of the array columns.
+            columns: Dictionary of variable names and Columns.
+            interval: Record every interval steps.
+            capacity: Number of recorded steps to allocate room for; more room
+                is allocated when needed.
+        """
+        self.agents = list(agents)
+        self.agent_ids = np.array([agent.unique_id for agent in self.agents])
+        self.columns = columns
+        self.interval = interval
+        self.steps = []
+        self.data = {
+            name: np.empty((max(capacity, 1), len(self.agents)), dtype=column.dtype)
+            for name, column in columns.items()
+        }
+
+    def collect(self, model):
+        """Record the agent variables, if the step is one to record."""
+        step = model.schedule.steps
+        if step % self.interval:
+            return
+        row = len(self.steps)
+        for name, column in self.columns.items():
+            array = self.data[name]
+            if row == len(array):
+                array = np.concatenate([array, np.empty_like(array)])
+                self.data[name] = array
+            array[row] = column.encode(self.agents)
+        self.steps.append(step)
+
+    def get_agent_vars_dataframe(self):
+        """
+        Return the recorded variables as a DataFrame indexed by (Step,
+        AgentID), like DataCollector.get_agent_vars_dataframe().
+        """
+        rows = len(self.steps)
+        index = pd.MultiIndex.from_product(
+            [self.steps, self.agent_ids], names=["Step", "AgentID"]
+        )
+        return pd.DataFrame(
+            {
+                name: column.decode(self.data[name][:rows].ravel())
+                for name, column in self.columns.items()
+            },
+            index=index,
+        )
+
+    def to_parquet(self, path):
+        """
+        Write the recorded variables to a Parquet file, one row per step and
+        agent. Needs pyarrow or fastparquet, like DataFrame.to_parquet().
+        """
+        self.get_agent_vars_dataframe().reset_index().to_parquet(path, index=False)
@@ -46,6 +46,7 @@ model_params = dict(
     cop_vision=7,
     legitimacy=0.8,
     max_jail_term=1000,
+    vision_counts=mesa.visualization.Checkbox("Count within vision", False),
 )
 
 canvas_element = mesa.visualization.CanvasGrid(citizen_cop_portrayal, 40, 40, 480, 480)
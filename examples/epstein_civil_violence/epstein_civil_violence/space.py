@@ -0,0 +1,108 @@
+"""
+SingleGrid with an index of its empty cells.
+"""
+
+import mesa
+import numpy as np
+
+
+class EmptyCells:
+    """
+    The empty cells of a grid, as a set with constant-time add, discard and
+    random choice, and as a boolean mask with one entry per cell.
+
+    Empty cells are kept in a dense list; a cell that fills up is swapped with
+    the last empty cell and popped, so random draws never have to build or
+    sort a list of candidates.
+    """
+
+    def __init__(self, cells):
+        """
+        Create the set with all of the given cells empty. The mask follows the
+        order of the cells.
+        """
+        self.cells = list(cells)
+        self._mask_index = {cell: i for i, cell in enumerate(self.cells)}
+        self.mask = np.ones(len(self.cells), dtype=bool)
+        self._empty = list(self.cells)
+        # index of every empty cell in self._empty
+        self._index = dict(self._mask_index)
+
+    def __len__(self):
+        return len(self._empty)
+
+    def __contains__(self, cell):
+        return cell in self._index
+
+    def __iter__(self):
+        return iter(self._empty)
+
+    def add(self, cell):
+        if cell not in self._index:
+            self._index[cell] = len(self._empty)
+            self._empty.append(cell)
+            self.mask[self._mask_index[cell]] = True
+
+    def discard(self, cell):
+        index = self._index.pop(cell, None)
+        if index is None:
+            return
+        last = self._empty.pop()
+        if last != cell:
+            self._empty[index] = last
+            self._index[last] = index
+        self.mask[self._mask_index[cell]] = False
+
+    def choice(self, random):
+        """Return a random empty cell, drawn with the given random generator."""
+        return self._empty[random.randrange(len(self._empty))]
+
+
+class EmptyIndexedSingleGrid(mesa.space.SingleGrid):
+    """
+    SingleGrid that keeps an index of its empty cells up to date on every
+    place, move and remove.
+
+    Checking whether a cell is empty is a set lookup, moving an agent to a
+    random empty cell takes constant time, and empty_mask gives all empty
+    cells at once as a (width, height) boolean array.
+    """
+
+    def __init__(self, width, height, torus):
+        super().__init__(width, height, torus)
+        self.empty_cells = EmptyCells(
+            (x, y) for x in range(width) for y in range(height)
+        )
+
+    @property
+    def empties(self):
+        return self.empty_cells
+
+    @property
+    def empty_mask(self):
+        """Boolean (width, height) array of the empty cells; do not modify."""
+        return self.empty_cells.mask.reshape(self.width, self.height)
+
+    def is_cell_empty(self, pos):
+        """Returns a bool of the contents of a cell."""
+        return pos in self.empty_cells
+
+    def place_agent(self, agent, pos):
+        """Place the agent at the specified location, and set its pos variable."""
+        super().place_agent(agent, pos)
+        self.empty_cells.discard(pos)
+
+    def remove_agent(self, agent):
+        """Remove the agent from the grid and set its pos attribute to None."""
+        pos = agent.pos
+        super().remove_agent(agent)
+        if pos is not None:
+            self.empty_cells.add(pos)
+
+    def move_to_empty(self, agent):
+        """Moves agent to a random empty cell, vacating agent's old cell."""
+        if not self.empty_cells:
+            raise Exception("ERROR: No empty cells")
+        new_pos = self.empty_cells.choice(agent.random)
+        self.remove_agent(agent)
+        self.place_agent(agent, new_pos)
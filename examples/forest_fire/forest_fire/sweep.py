@@ -0,0 +1,200 @@
+"""
+Percolation sweep for the Forest Fire model.
+
+Runs many (density, seed) replicates of FireFrontForestFire across a process
+pool and summarizes the fraction of trees burned at each density, with a
+normal-approximation confidence interval. After a first pass, replicates are
+added where the burned fraction varies most between runs, which is around the
+critical density where the fire only just percolates through the forest.
+
+Completed runs can be cached on disk, keyed by (width, height, density, seed),
+so that repeated or extended sweeps only run what is missing.
+
+Run it from the example directory:
+
+    $ python -m forest_fire.sweep
+"""
+
+import csv
+import math
+import os
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .fire_front import FireFrontForestFire
+
+# z value of a two-sided 95% confidence interval
+Z_95 = 1.959964
+
+
+def burned_fraction(width, height, density, seed):
+    """Run one forest fire to the end and return the fraction of trees burned."""
+    fire = FireFrontForestFire(width, height, density, seed=seed)
+    fire.run_model()
+    if fire.num_trees == 0:
+        return 0.0
+    return FireFrontForestFire.count_type(fire, "Burned Out") / fire.num_trees
+
+
+def _run(task):
+    return task, burned_fraction(*task)
+
+
+class ResultCache:
+    """
+    Burned fractions of completed runs, keyed by (width, height, density,
+    seed) and stored as rows of a CSV file. Without a path, results are only
+    kept in memory.
+    """
+
+    fields = ["width", "height", "density", "seed", "burned_fraction"]
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else None
+        self.results = {}
+        if self.path is not None and self.path.exists():
+            with self.path.open(newline="") as file:
+                for row in csv.DictReader(file):
+                    key = self.key(
+                        int(row["width"]),
+                        int(row["height"]),
+                        float(row["density"]),
+                        int(row["seed"]),
+                    )
+                    self.results[key] = float(row["burned_fraction"])
+
+    @staticmethod
+    def key(width, height, density, seed):
+        # round densities so that e.g. np.linspace values hit the cache
+        return width, height, round(float(density), 9), seed
+
+    def __contains__(self, task):
+        return self.key(*task) in self.results
+
+    def __getitem__(self, task):
+        return self.results[self.key(*task)]
+
+    def add(self, results):
+        """
+        Store (task, burned_fraction) pairs, appending each to the file as
+        soon as it arrives, so that an interrupted sweep keeps the runs it
+        completed.
+        """
+        file = None
+        try:
+            for task, fraction in results:
+                key = self.key(*task)
+                self.results[key] = fraction
+                if self.path is None:
+                    continue
+                if file is None:
+                    new_file = not self.path.exists()
+                    file = self.path.open("a", newline="")
+                    writer = csv.writer(file)
+                    if new_file:
+                        writer.writerow(self.fields)
+                writer.writerow([*key, fraction])
+                file.flush()
+        finally:
+            if file is not None:
+                file.close()
+
+
+def summarize(densities, seeds, cache, width, height):
+    """Return the burned fraction curve for the runs done so far."""
+    rows = []
+    for density in densities:
+        fractions = np.array(
+            [cache[(width, height, density, seed)] for seed in seeds[density]]
+        )
+        n = len(fractions)
+        # a single run says nothing about the spread, so it gets no interval
+        std = fractions.std(ddof=1) if n > 1 else math.nan
+        half_width = Z_95 * std / math.sqrt(n)
+        mean = fractions.mean()
+        rows.append(
+            {
+                "density": density,
+                "replicates": n,
+                "burned_fraction": mean,
+                "std": std,
+                "ci_low": np.clip(mean - half_width, 0.0, 1.0),
+                "ci_high": np.clip(mean + half_width, 0.0, 1.0),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def sweep(
+    densities,
+    width=100,
+    height=100,
+    replicates=10,
+    adaptive_rounds=3,
+    focus=5,
+    cache_path=None,
+    processes=None,
+):
+    """
+    Sweep the tree density and return the burned fraction curve.
+
+    Args:
+        densities: Tree densities to run.
+        width, height: The size of the forests.
+        replicates: Runs per density in the first pass, and runs added per
+                    density in each adaptive round.
+        adaptive_rounds: Number of rounds adding replicates to the densities
+                         where the burned fraction varies most.
+        focus: Number of densities that get more replicates in each round.
+        cache_path: CSV file to read completed runs from and add new runs to.
+        processes: Number of worker processes, by default one per CPU.
+
+    Returns:
+        A DataFrame with, for each density, the number of replicates, the mean
+        and standard deviation of the burned fraction, and the bounds of its
+        95% confidence interval, clipped to [0, 1]. The standard deviation
+        and the bounds are NaN for a density with a single replicate.
+    """
+    densities = [float(density) for density in densities]
+    cache = ResultCache(cache_path)
+    seeds = {density: range(replicates) for density in densities}
+
+    processes = processes or os.cpu_count() or 1
+    with Pool(processes) as pool:
+
+        def run(tasks):
+            missing = [task for task in tasks if task not in cache]
+            # each run is a whole fire, so results are handed back one by one
+            cache.add(pool.imap_unordered(_run, missing))
+
+        run(
+            [
+                (width, height, density, seed)
+                for density in densities
+                for seed in seeds[density]
+            ]
+        )
+        for _ in range(adaptive_rounds):
+            curve = summarize(densities, seeds, cache, width, height)
+            # densities with a single run have an unknown spread, so go first
+            spread = curve["std"].fillna(math.inf)
+            varied = curve.loc[spread.nlargest(focus).index, "density"]
+            tasks = []
+            for density in varied:
+                start = len(seeds[density])
+                seeds[density] = range(start + replicates)
+                tasks += [
+                    (width, height, density, seed)
+                    for seed in range(start, start + replicates)
+                ]
+            run(tasks)
+
+    return summarize(densities, seeds, cache, width, height)
+
+
+if __name__ == "__main__":
+    curve = sweep(np.linspace(0, 1, 101)[1:], width=50, height=50)
+    print(curve.to_string(index=False))
@@ -0,0 +1,82 @@
+import heapq
+
+import mesa
+
+
+class FrontierActivation(mesa.time.SimultaneousActivation):
+    """
+    Simultaneous activation that only steps the frontier of a growing
+    snowflake: the dead cells marked isConsidered, which are the only cells
+    that can come alive.
+
+    Neighbors are taken from the model's neighbor index instead of
+    grid.iter_neighbors. Alive cells stay alive forever, so a dead
+    cell with two or more live neighbors will never come alive; it is dropped
+    from the frontier. What is left is the outline of the snowflake, so a step
+    costs in proportion to its perimeter rather than to the area of the grid.
+
+    Cells are stepped in the order they were added, like SimultaneousActivation
+    does. A cell marked isConsidered during a step by a cell before it is
+    stepped in the same step, as it would have been by SimultaneousActivation,
+    so both schedules give the same results.
+    """
+
+    def __init__(self, model):
+        super().__init__(model)
+        self._order = {}
+        self.frontier = None
+
+    def add(self, agent):
+        super().add(agent)
+        self._order[agent.unique_id] = len(self._order)
+
+    def consider(self, cells):
+        """Keep those of the cells that can still come alive in the frontier."""
+        live_neighbors = self.model.count_live_neighbors([cell.index for cell in cells])
+        for cell, count in zip(cells, live_neighbors.tolist()):
+            if cell.isConsidered and not cell.isAlive and count < 2:
+                self.frontier.add(cell.unique_id)
+            else:
+                self.frontier.discard(cell.unique_id)
+
+    def step(self):
+        """Step the frontier cells, then advance them."""
+        if self.frontier is None:
+            self.frontier = set()
+            self.consider(self.agents)
+        order = self._order
+        queue = [(order[unique_id], unique_id) for unique_id in self.frontier]
+        heapq.heapify(queue)
+        queued = set(self.frontier)
+        cells = []
+        while queue:
+            position, unique_id = heapq.heappop(queue)
+            cell = self._agents[unique_id]
+            cell.step()
+            cells.append(cell)
+            if cell.isAlive or cell._nextState != cell.ALIVE:
+                continue
+            # the cell is coming alive and has marked its neighbors considered
+            for neighbor in cell.neighbors:
+                neighbor_id = neighbor.unique_id
+                if (
+                    not neighbor.isAlive
+                    and neighbor_id not in queued
+                    and order[neighbor_id] > position
+                ):
+                    heapq.heappush(queue, (order[neighbor_id], neighbor_id))
+                    queued.add(neighbor_id)
+        for cell in cells:
+            cell.advance()
+
+        # cells that came alive, and their neighbors, may leave the frontier
+        changed = {}
+        for cell in cells:
+            if cell.isAlive:
+                changed[cell.unique_id] = cell
+                changed.update(
+                    (neighbor.unique_id, neighbor) for neighbor in cell.neighbors
+                )
+        self.consider(list(changed.values()))
+        self.steps += 1
+        self.time += 1
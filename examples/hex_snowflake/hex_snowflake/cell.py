@@ -13,7 +13,11 @@ class Cell(mesa.Agent):
         """
         super().__init__(pos, model)
         self.x, self.y = pos
+        # position in model.cells, and the cell's neighbors, set by the model
+        self.index = self.x * model.grid.height + self.y
+        self.neighbor_cells = []
         self.state = init_state
+        model.states[self.index] = init_state
         self._nextState = None
         self.isConsidered = False
 
@@ -23,7 +27,7 @@ class Cell(mesa.Agent):
 
     @property
     def neighbors(self):
-        return self.model.grid.iter_neighbors((self.x, self.y))
+        return self.neighbor_cells
 
     @property
     def considered(self):
@@ -56,5 +60,8 @@ class Cell(mesa.Agent):
     def advance(self):
         """
         Set the state to the new computed state -- computed in step().
+        The model's array of cell states is kept in step with it.
         """
-        self.state = self._nextState
+        if self._nextState != self.state:
+            self.state = self._nextState
+            self.model.states[self.index] = self.state
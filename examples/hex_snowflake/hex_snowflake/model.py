@@ -1,6 +1,9 @@
 import mesa
+import numpy as np
 
+from hex_snowflake.activity import FrontierActivation
 from hex_snowflake.cell import Cell
+from hex_snowflake.neighbors import hex_neighbor_index
 
 
 class HexSnowflake(mesa.Model):
@@ -9,9 +12,20 @@ class HexSnowflake(mesa.Model):
     of cells with adjacency rules specific to hexagons.
     """
 
-    def __init__(self, width=50, height=50):
+    schedule_types = {
+        "Simultaneous": mesa.time.SimultaneousActivation,
+        "Frontier": FrontierActivation,
+    }
+
+    def __init__(self, width=50, height=50, schedule_type="Simultaneous"):
         """
         Create a new playing area of (width, height) cells.
+
+        Args:
+            width, height: Size of the playing area.
+            schedule_type: "Simultaneous" steps every cell; "Frontier" only
+                           the dead cells next to the snowflake. The
+                           snowflake grows the same either way.
         """
 
         # Set up the grid and schedule.
@@ -20,26 +34,52 @@ class HexSnowflake(mesa.Model):
         # computing their next state simultaneously.  This needs to
         # be done because each cell's next state depends on the current
         # state of all its neighbors -- before they've changed.
-        self.schedule = mesa.time.SimultaneousActivation(self)
+        self.schedule = self.schedule_types[schedule_type](self)
 
         # Use a hexagonal grid, where edges wrap around.
         self.grid = mesa.space.HexGrid(width, height, torus=True)
 
-        # Place a dead cell at each location.
+        # The state of every cell, by cell number, mirrored by the cells
+        # whenever their state changes. The extra last entry stays -1, so that the -1 of a missing
+        # neighbor in neighbor_index looks up a state of -1.
+        self.states = np.zeros(width * height + 1, dtype=np.int8)
+        self.states[-1] = -1
+
+        # Place a dead cell at each location. Cells are numbered in the same
+        # order, see hex_neighbor_index().
+        self.cells = []
         for contents, x, y in self.grid.coord_iter():
             cell = Cell((x, y), self)
             self.grid.place_agent(cell, (x, y))
             self.schedule.add(cell)
+            self.cells.append(cell)
+
+        # Look up every cell's neighbors once, rather than on each access.
+        self.neighbor_index = hex_neighbor_index(width, height, self.grid.torus)
+        for cell, row in zip(self.cells, self.neighbor_index.tolist()):
+            cell.neighbor_cells = [self.cells[i] for i in row if i >= 0]
 
         # activate the center(ish) cell.
         centerishCell = self.grid[width // 2][height // 2]
 
         centerishCell.state = 1
+        self.states[centerishCell.index] = 1
         for a in centerishCell.neighbors:
             a.isConsidered = True
 
         self.running = True
 
+    def neighbor_states(self, indices):
+        """
+        Return the states of the neighbors of the cells with the given
+        numbers, as a (len(indices), 6) array with -1 for missing neighbors.
+        """
+        return self.states[self.neighbor_index[indices]]
+
+    def count_live_neighbors(self, indices):
+        """Return the number of live neighbors of the cells with the given numbers."""
+        return np.count_nonzero(self.neighbor_states(indices) == Cell.ALIVE, axis=1)
+
     def step(self):
         """
         Have the scheduler advance each cell by one step
@@ -0,0 +1,42 @@
+import numpy as np
+
+# Offsets of the six neighbors of a cell in an even and an odd column, in the
+# odd-q layout of mesa.space.HexGrid.
+EVEN_COLUMN = [(0, -1), (0, 1), (-1, 1), (-1, 0), (1, 1), (1, 0)]
+ODD_COLUMN = [(0, -1), (0, 1), (-1, 0), (-1, -1), (1, 0), (1, -1)]
+
+
+def hex_neighbor_index(width, height, torus):
+    """
+    Precompute the neighbors of every cell of a HexGrid.
+
+    Cells are numbered x * height + y, the order of grid.coord_iter(). Row i
+    of the returned (width * height, 6) array holds the numbers of the
+    neighbors of cell i in the order grid.iter_neighbors() yields them,
+    followed by -1 for each missing neighbor: on the edges of a grid that is
+    not a torus, or where a torus is too small for six distinct neighbors.
+    """
+    index = np.arange(width * height)
+    x, y = np.divmod(index, height)
+    offsets = np.where(
+        (x % 2 == 0)[:, None, None], np.array(EVEN_COLUMN), np.array(ODD_COLUMN)
+    )
+    nx = x[:, None] + offsets[:, :, 0]
+    ny = y[:, None] + offsets[:, :, 1]
+    if torus:
+        missing = np.zeros(nx.shape, dtype=bool)
+        nx %= width
+        ny %= height
+    else:
+        missing = (nx < 0) | (nx >= width) | (ny < 0) | (ny >= height)
+    neighbors = nx * height + ny
+    # the grid lists neighbors sorted by position, without repeats or the
+    # cell itself, which only occur on tiny tori
+    size = width * height
+    neighbors = np.sort(np.where(missing, size, neighbors), axis=1)
+    repeated = np.zeros(neighbors.shape, dtype=bool)
+    repeated[:, 1:] = neighbors[:, 1:] == neighbors[:, :-1]
+    neighbors[repeated | (neighbors == index[:, None])] = size
+    neighbors = np.sort(neighbors, axis=1)
+    neighbors[neighbors == size] = -1
+    return neighbors
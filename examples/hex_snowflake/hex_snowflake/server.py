@@ -8,6 +8,16 @@ width, height = 50, 50
 # Make a world that is 50x50, on a 500x500 display.
 canvas_element = mesa.visualization.CanvasHexGrid(portrayCell, width, height, 500, 500)
 
+model_params = {
+    "height": height,
+    "width": width,
+    "schedule_type": mesa.visualization.Choice(
+        "Scheduler type",
+        value="Simultaneous",
+        choices=list(HexSnowflake.schedule_types.keys()),
+    ),
+}
+
 server = mesa.visualization.ModularServer(
-    HexSnowflake, [canvas_element], "Hex Snowflake", {"height": height, "width": width}
+    HexSnowflake, [canvas_element], "Hex Snowflake", model_params
 )
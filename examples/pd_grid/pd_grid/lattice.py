@@ -0,0 +1,127 @@
+import numpy as np
+
+# Offsets of the Moore neighborhood including the center, in the order in
+# which grid.get_neighbors returns the agents on a torus.
+NEIGHBORHOOD = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def shifted(array, dx, dy):
+    """Return the array with the value at (x + dx, y + dy) at (x, y), on a torus."""
+    return np.roll(array, (-dx, -dy), axis=(0, 1))
+
+
+def box_sum(array):
+    """Return the sum of every 3x3 block of a 2D array, on a torus."""
+    padded = np.pad(array.astype(np.uint8), 1, mode="wrap")
+    width, height = array.shape
+    total = np.zeros((width, height), dtype=np.uint8)
+    for dx in range(3):
+        for dy in range(3):
+            total += padded[dx : dx + width, dy : dy + height]
+    return total
+
+
+class Lattice:
+    """
+    The whole spatial prisoner's dilemma as arrays indexed [x, y] like the
+    grid: whether each player cooperates, as a boolean array, and each
+    player's score, as a float array. Edges wrap around, and the grid must be
+    at least 3 cells wide and high.
+
+    A step follows PDAgent under SimultaneousActivation: every player takes
+    the move of the highest scoring player in its Moore neighborhood,
+    itself included and ties going to the first in the order of
+    grid.get_neighbors, and then scores against the new moves of its eight
+    neighbors. The imitation is a 3x3 running argmax over the scores, and the
+    payoffs only depend on the number of cooperating neighbors, which is a
+    3x3 box sum of the cooperators.
+    """
+
+    def __init__(self, cooperating, payoff):
+        """
+        Args:
+            cooperating: Boolean array of the players that cooperate.
+            payoff: Dictionary of (move, neighbor_move) payoffs.
+        """
+        self.cooperating = np.array(cooperating, dtype=bool)
+        self.width, self.height = self.cooperating.shape
+        if min(self.width, self.height) < 3:
+            raise ValueError(
+                f"A lattice must be at least 3x3, not {self.width}x{self.height}"
+            )
+        self.score = np.zeros(self.cooperating.shape)
+        # Score gained with each move (0 for D, 1 for C) against each number
+        # of cooperating neighbors. The payoffs are added one at a time, like
+        # PDAgent.increment_score does, so scores are identical whenever only
+        # the order of the additions could differ, as when one of the payoffs
+        # of each move is zero, as in the default payoffs.
+        self.gain = np.array(
+            [
+                [
+                    sum([payoff[(move, "C")]] * n + [payoff[(move, "D")]] * (8 - n))
+                    for n in range(9)
+                ]
+                for move in ("D", "C")
+            ]
+        )
+
+    def step(self):
+        """Advance all players by one step."""
+        best_score = None
+        for dx, dy in NEIGHBORHOOD:
+            score = shifted(self.score, dx, dy)
+            move = shifted(self.cooperating, dx, dy)
+            if best_score is None:
+                best_score, best_move = score, move
+                continue
+            better = score > best_score
+            best_score = np.where(better, score, best_score)
+            best_move = np.where(better, move, best_move)
+        self.cooperating = best_move
+
+        neighbors = box_sum(self.cooperating) - self.cooperating
+        self.score += self.gain[self.cooperating.astype(np.intp), neighbors]
+
+
+class LatticePlayer:
+    """
+    Read-only view of one player of a Lattice, with the attributes of a
+    PDAgent that the portrayal uses.
+    """
+
+    def __init__(self, lattice, pos):
+        self.lattice = lattice
+        self.pos = pos
+
+    @property
+    def move(self):
+        return "C" if self.lattice.cooperating[self.pos] else "D"
+
+    @property
+    def score(self):
+        return float(self.lattice.score[self.pos])
+
+    @property
+    def isCooroperating(self):
+        return bool(self.lattice.cooperating[self.pos])
+
+
+class LatticeGrid:
+    """
+    Stands in for the model's grid when the players live in a Lattice,
+    handing out LatticePlayer views for the cells that are asked for.
+    """
+
+    def __init__(self, lattice):
+        self.lattice = lattice
+        self.width = lattice.width
+        self.height = lattice.height
+        self.torus = True
+
+    def get_cell_list_contents(self, cell_list):
+        if isinstance(cell_list, tuple) and len(cell_list) == 2:
+            cell_list = [cell_list]
+        return [LatticePlayer(self.lattice, pos) for pos in cell_list]
+
+    def __getitem__(self, x):
+        return [LatticePlayer(self.lattice, (x, y)) for y in range(self.height)]
@@ -1,6 +1,8 @@
 import mesa
+import numpy as np
 
 from .agent import PDAgent
+from .lattice import Lattice, LatticeGrid
 
 
 class PdGrid(mesa.Model):
@@ -12,13 +14,24 @@ class PdGrid(mesa.Model):
         "Simultaneous": mesa.time.SimultaneousActivation,
     }
 
+    # "agents" steps one PDAgent per grid cell; "numpy" keeps all players in
+    # arrays and steps them with array operations, which is only done for the
+    # Simultaneous schedule.
+    backends = ("agents", "numpy")
+
     # This dictionary holds the payoff for this agent,
     # keyed on: (my_move, other_move)
 
     payoff = {("C", "C"): 1, ("C", "D"): 0, ("D", "C"): 1.6, ("D", "D"): 0}
 
     def __init__(
-        self, width=50, height=50, schedule_type="Random", payoffs=None, seed=None
+        self,
+        width=50,
+        height=50,
+        schedule_type="Random",
+        payoffs=None,
+        seed=None,
+        backend="agents",
     ):
         """
         Create a new Spatial Prisoners' Dilemma Model.
@@ -28,7 +41,43 @@ class PdGrid(mesa.Model):
             schedule_type: Can be "Sequential", "Random", or "Simultaneous".
                            Determines the agent activation regime.
             payoffs: (optional) Dictionary of (move, neighbor_move) payoffs.
+            backend: "agents" or "numpy". The numpy backend steps all players
+                     at once, so it only applies to the Simultaneous
+                     schedule; with the Sequential and Random schedules, the
+                     model falls back to the agents backend. It also does on
+                     grids narrower or lower than 3 cells, where a player's
+                     neighbors repeat, see Lattice. With the same seed, both
+                     backends give the same moves at every step.
         """
+        if backend not in self.backends:
+            raise ValueError(f"Unknown backend: {backend}")
+        if schedule_type != "Simultaneous" or min(width, height) < 3:
+            backend = "agents"
+        self.backend = backend
+
+        if backend == "numpy":
+            self.schedule_type = schedule_type
+            # Draw the starting moves in grid order, as the agents do.
+            cooperating = np.zeros((width, height), dtype=bool)
+            for x in range(width):
+                for y in range(height):
+                    cooperating[x, y] = self.random.choice(["C", "D"]) == "C"
+            self.lattice = Lattice(cooperating, self.payoff)
+            # The schedule holds no agents; it only keeps the step count.
+            self.schedule = mesa.time.BaseScheduler(self)
+            # Players are only materialized when the visualization asks.
+            self.grid = LatticeGrid(self.lattice)
+            self.datacollector = mesa.DataCollector(
+                {
+                    "Cooperating_Agents": lambda m: int(
+                        np.count_nonzero(m.lattice.cooperating)
+                    )
+                }
+            )
+            self.running = True
+            self.datacollector.collect(self)
+            return
+
         self.grid = mesa.space.SingleGrid(width, height, torus=True)
         self.schedule_type = schedule_type
         self.schedule = self.schedule_types[self.schedule_type](self)
@@ -52,6 +101,8 @@ class PdGrid(mesa.Model):
         self.datacollector.collect(self)
 
     def step(self):
+        if self.backend == "numpy":
+            self.lattice.step()
         self.schedule.step()
         # collect data
         self.datacollector.collect(self)
@@ -15,6 +15,11 @@ model_params = {
         value="Random",
         choices=list(PdGrid.schedule_types.keys()),
     ),
+    "backend": mesa.visualization.Choice(
+        "Backend (numpy only applies to Simultaneous)",
+        value="agents",
+        choices=list(PdGrid.backends),
+    ),
 }
 
 server = mesa.visualization.ModularServer(
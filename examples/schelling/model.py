@@ -1,5 +1,7 @@
 import mesa
 
+from space import EmptyIndexedSingleGrid
+
 
 class SchellingAgent(mesa.Agent):
     """
@@ -47,7 +49,7 @@ class Schelling(mesa.Model):
         self.homophily = homophily
 
         self.schedule = mesa.time.RandomActivation(self)
-        self.grid = mesa.space.SingleGrid(width, height, torus=True)
+        self.grid = EmptyIndexedSingleGrid(width, height, torus=True)
 
         self.happy = 0
         self.datacollector = mesa.DataCollector(
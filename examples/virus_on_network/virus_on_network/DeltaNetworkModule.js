@@ -0,0 +1,165 @@
+const DeltaNetworkModule = function (svg_width, svg_height, style) {
+  // Create the svg element:
+  const svg = d3.create("svg");
+  svg
+    .attr("class", "NetworkModule_d3")
+    .attr("width", svg_width)
+    .attr("height", svg_height)
+    .style("border", "1px dotted");
+
+  // Append svg to #elements:
+  document.getElementById("elements").appendChild(svg.node());
+
+  const width = +svg.attr("width");
+  const height = +svg.attr("height");
+  const g = svg.append("g").classed("network_root", true);
+
+  const tooltip = d3
+    .select("body")
+    .append("div")
+    .attr("class", "d3tooltip")
+    .style("opacity", 0);
+
+  const zoom = d3.zoom().on("zoom", (event) => {
+    g.attr("transform", event.transform);
+  });
+
+  svg.call(zoom);
+
+  svg.call(zoom.transform, d3.zoomIdentity.translate(width / 2, height / 2));
+
+  const links = g.append("g").attr("class", "links");
+
+  const nodes = g.append("g").attr("class", "nodes");
+
+  // State of every node, and the edges of every node, kept between frames,
+  // and the token of the model they belong to
+  let model = null;
+  let states = [];
+  let incident = [];
+  let circles = [];
+  let lines = [];
+
+  const highlighted = (edge) =>
+    style.highlight.includes(states[edge.source.index]) ||
+    style.highlight.includes(states[edge.target.index]);
+
+  const styleEdges = (selection) =>
+    selection
+      .attr("stroke", (d) => (highlighted(d) ? "#000000" : "#e8e8e8"))
+      .attr("stroke-width", (d) => (highlighted(d) ? 3 : 2));
+
+  const styleNodes = (selection) =>
+    selection.attr("fill", (d) => style.colors[states[d.index]]);
+
+  // Lay out and draw the whole network, from a full frame of a new model
+  const drawNetwork = (data) => {
+    model = data.model;
+    const bytes = Uint8Array.from(atob(data.edges), (c) => c.charCodeAt(0));
+    const pairs = new Int32Array(bytes.buffer);
+    states = data.states;
+    const graph = {
+      nodes: states.map((_, index) => ({ index })),
+      edges: [],
+    };
+    incident = states.map(() => []);
+    for (let i = 0; i < pairs.length / 2; i++) {
+      graph.edges.push({ source: pairs[2 * i], target: pairs[2 * i + 1] });
+      incident[pairs[2 * i]].push(i);
+      incident[pairs[2 * i + 1]].push(i);
+    }
+
+    const simulation = d3
+      .forceSimulation()
+      .nodes(graph.nodes)
+      .force("charge", d3.forceManyBody().strength(-80).distanceMin(2))
+      .force("link", d3.forceLink(graph.edges))
+      .force("center", d3.forceCenter())
+      .stop();
+
+    for (
+      let i = 0,
+        n = Math.ceil(
+          Math.log(simulation.alphaMin()) /
+            Math.log(1 - simulation.alphaDecay())
+        );
+      i < n;
+      ++i
+    ) {
+      simulation.tick();
+    }
+
+    links.selectAll("line").remove();
+    links
+      .selectAll("line")
+      .data(graph.edges)
+      .enter()
+      .append("line")
+      .attr("x1", (d) => d.source.x)
+      .attr("y1", (d) => d.source.y)
+      .attr("x2", (d) => d.target.x)
+      .attr("y2", (d) => d.target.y)
+      .call(styleEdges);
+    lines = links.selectAll("line").nodes();
+
+    nodes.selectAll("circle").remove();
+    nodes
+      .selectAll("circle")
+      .data(graph.nodes)
+      .enter()
+      .append("circle")
+      .attr("cx", (d) => d.x)
+      .attr("cy", (d) => d.y)
+      .attr("r", 6)
+      .call(styleNodes)
+      .on("mouseover", function (event, d) {
+        tooltip.transition().duration(200).style("opacity", 0.9);
+        tooltip
+          .html(`id: ${d.index}<br>state: ${style.names[states[d.index]]}`)
+          .style("left", event.pageX + "px")
+          .style("top", event.pageY + "px");
+      })
+      .on("mouseout", function () {
+        tooltip.transition().duration(500).style("opacity", 0);
+      });
+    circles = nodes.selectAll("circle").nodes();
+  };
+
+  // Restyle every node and edge, from a full frame of the drawn model
+  const restyleNetwork = (data) => {
+    states = data.states;
+    d3.selectAll(circles).call(styleNodes);
+    d3.selectAll(lines).call(styleEdges);
+  };
+
+  // Restyle the nodes that changed state, and their edges
+  const updateNetwork = (data) => {
+    const changedNodes = new Set();
+    const changedEdges = new Set();
+    data.changed.forEach((node, i) => {
+      if (node >= circles.length) return;
+      states[node] = data.states[i];
+      changedNodes.add(node);
+      incident[node].forEach((edge) => changedEdges.add(edge));
+    });
+    d3.selectAll([...changedNodes].map((node) => circles[node])).call(styleNodes);
+    d3.selectAll([...changedEdges].map((edge) => lines[edge])).call(styleEdges);
+  };
+
+  // Changes for a model other than the drawn one, such as the model of
+  // another tab's reset, are ignored until its next full frame.
+  this.render = (data) => {
+    if (data.model !== model) {
+      if (data.reset) drawNetwork(data);
+    } else if (data.reset) restyleNetwork(data);
+    else updateNetwork(data);
+  };
+
+  this.reset = () => {
+    model = null;
+    states = [];
+    incident = [];
+    circles = [];
+    lines = [];
+  };
+};
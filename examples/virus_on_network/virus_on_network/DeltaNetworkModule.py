@@ -0,0 +1,113 @@
+import base64
+import json
+
+import mesa
+import numpy as np
+from mesa.visualization.ModularVisualization import D3_JS_FILE
+
+
+class DeltaNetworkModule(mesa.visualization.VisualizationElement):
+    """
+    Network visualization that sends the topology once and then only the
+    nodes whose state changed.
+
+    Each node has a small integer state, and everything drawn is derived from
+    it in the browser: the node colors, the tooltips, and the style of the
+    edges, which are highlighted when one of their ends is in one of the
+    highlight states. The first frame for a model holds the edges, packed
+    into a base64 string of little-endian Int32 (source, target) pairs, and the
+    states of all nodes; every later frame only holds the indices and new
+    states of the nodes that changed since the previous frame.
+
+    The element is shared by all browser tabs connected to the server, which
+    each receive only the frames they ask for. Every frame is tagged with a
+    token of its model, and a tab ignores the changes for a model other than
+    the one it has drawn, such as the model of another tab's reset. Full
+    frames are sent again at least every keyframe_interval frames, which
+    bring every tab back up to date; the browser only lays out the network
+    again when the model changed.
+    """
+
+    local_includes = ["virus_on_network/DeltaNetworkModule.js"]
+    package_includes = [D3_JS_FILE]
+
+    def __init__(
+        self,
+        node_states,
+        state_names,
+        state_colors,
+        highlight_states=(),
+        canvas_height=500,
+        canvas_width=500,
+        keyframe_interval=100,
+    ):
+        """
+        Instantiate a new DeltaNetworkModule.
+
+        Args:
+            node_states: Function of a model returning the state of every
+                node, in the order of model.G.nodes, as an integer array.
+            state_names, state_colors: Name and color of each state, indexed
+                by state.
+            highlight_states: States whose nodes have their edges drawn
+                thick and black instead of thin and light grey.
+            canvas_height, canvas_width: Size of the canvas in pixels.
+            keyframe_interval: Send the edges and the states of all nodes at
+                least once every keyframe_interval frames.
+        """
+        self.node_states = node_states
+        self.canvas_height = canvas_height
+        self.canvas_width = canvas_width
+        self.keyframe_interval = keyframe_interval
+        # what was last sent
+        self._sent_model = None
+        self._model_token = 0
+        self._frame = 0
+        self._keyframe = 0
+        self._sent_edges = None
+        self._sent_states = None
+        style = {
+            "names": list(state_names),
+            "colors": list(state_colors),
+            "highlight": list(highlight_states),
+        }
+        new_element = "new DeltaNetworkModule({}, {}, {})".format(
+            self.canvas_width, self.canvas_height, json.dumps(style)
+        )
+        self.js_code = "elements.push(" + new_element + ");"
+
+    def render(self, model):
+        states = np.asarray(self.node_states(model))
+        self._frame += 1
+        if model is not self._sent_model:
+            self._sent_model = model
+            self._model_token += 1
+            self._keyframe = 0
+            nodes = {node: i for i, node in enumerate(model.G.nodes)}
+            edges = np.array(
+                [(nodes[source], nodes[target]) for source, target in model.G.edges],
+                dtype="<i4",
+            )
+            self._sent_edges = base64.b64encode(edges.tobytes()).decode("ascii")
+
+        if (
+            self._keyframe == 0
+            or self._frame - self._keyframe >= self.keyframe_interval
+        ):
+            self._keyframe = self._frame
+            self._sent_states = states.copy()
+            return {
+                "reset": True,
+                "model": self._model_token,
+                "edges": self._sent_edges,
+                "states": states.tolist(),
+            }
+
+        (changed,) = np.nonzero(states != self._sent_states)
+        self._sent_states[changed] = states[changed]
+        return {
+            "reset": False,
+            "model": self._model_token,
+            "changed": changed.tolist(),
+            "states": states[changed].tolist(),
+        }
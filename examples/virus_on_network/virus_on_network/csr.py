@@ -0,0 +1,173 @@
+"""
+Array engine for the Virus on a Network model.
+
+CSRVirusOnNetwork converts the contact graph into compressed sparse row (CSR)
+adjacency arrays once, and keeps the state of every node as one int8 code,
+the value of its State. Each step, all infected nodes try to infect their
+susceptible neighbors at once, with one Bernoulli draw per edge leaving an
+infected node, and then check their situation, with the recovery and
+resistance draws masked to the nodes they apply to.
+
+In VirusOnNetwork the agents are activated one at a time in random order, so
+a node infected during a step may already spread the virus or check its
+situation in that same step, depending on whether it comes after or before
+its infector. Here the update is synchronous: the nodes infected at the start
+of a step spread and check, and nodes infected during the step only do so
+from the next step on. The epidemic therefore advances a little more slowly
+per step, but follows the same rules.
+"""
+
+import math
+
+import mesa
+import numpy as np
+
+from .graphs import make_graph
+from .model import TRANSITIONS, State
+
+SUSCEPTIBLE = State.SUSCEPTIBLE.value
+INFECTED = State.INFECTED.value
+RESISTANT = State.RESISTANT.value
+
+
+def number_state(model, state):
+    return int(model.counts[state.value])
+
+
+def number_infected(model):
+    return number_state(model, State.INFECTED)
+
+
+def number_susceptible(model):
+    return number_state(model, State.SUSCEPTIBLE)
+
+
+def number_resistant(model):
+    return number_state(model, State.RESISTANT)
+
+
+class CSRVirusOnNetwork(mesa.Model):
+    """
+    Virus model keeping the graph as CSR arrays and the node states as an
+    int8 array. See the module docstring for how it relates to
+    VirusOnNetwork.
+
+    There are no VirusAgents and no grid, so this engine is meant for batch
+    runs rather than for the visualization server.
+    """
+
+    def __init__(
+        self,
+        num_nodes=10,
+        avg_node_degree=3,
+        initial_outbreak_size=1,
+        virus_spread_chance=0.4,
+        virus_check_frequency=0.4,
+        recovery_chance=0.3,
+        gain_resistance_chance=0.5,
+        graph=None,
+        count_transitions=False,
+        seed=None,
+    ):
+        self.rng = np.random.default_rng(seed)
+        prob = avg_node_degree / num_nodes
+        # a CSRGraph, an edge list file, or None for a G(n, p) random graph
+        self.graph = make_graph(graph, num_nodes, prob, self.rng)
+        self.num_nodes = self.graph.num_nodes
+        self.indptr, self.indices = self.graph.indptr, self.graph.indices
+        self.degree = self.graph.degree
+        # the schedule holds no agents; it only keeps the step count
+        self.schedule = mesa.time.BaseScheduler(self)
+        self.initial_outbreak_size = (
+            initial_outbreak_size
+            if initial_outbreak_size <= self.num_nodes
+            else self.num_nodes
+        )
+        self.virus_spread_chance = virus_spread_chance
+        self.virus_check_frequency = virus_check_frequency
+        self.recovery_chance = recovery_chance
+        self.gain_resistance_chance = gain_resistance_chance
+
+        model_reporters = {
+            "Infected": number_infected,
+            "Susceptible": number_susceptible,
+            "Resistant": number_resistant,
+        }
+        if count_transitions:
+            model_reporters.update(
+                {name: lambda m, name=name: m.transitions[name] for name in TRANSITIONS}
+            )
+        self.datacollector = mesa.DataCollector(model_reporters)
+
+        self.state = np.full(self.num_nodes, SUSCEPTIBLE, dtype=np.int8)
+        # Infect some nodes
+        infected_nodes = self.rng.choice(
+            self.num_nodes, self.initial_outbreak_size, replace=False
+        )
+        self.state[infected_nodes] = INFECTED
+        # number of nodes in each state, indexed by state code
+        self.counts = np.bincount(self.state, minlength=len(State))
+        self.transitions = dict.fromkeys(TRANSITIONS, 0)
+        self.transitions["New Infections"] = len(infected_nodes)
+
+        self.running = True
+        self.datacollector.collect(self)
+
+    @property
+    def G(self):
+        """The graph as a networkx Graph, only built when first used."""
+        return self.graph.G
+
+    def resistant_susceptible_ratio(self):
+        try:
+            return number_state(self, State.RESISTANT) / number_state(
+                self, State.SUSCEPTIBLE
+            )
+        except ZeroDivisionError:
+            return math.inf
+
+    def edges_from(self, nodes):
+        """Return the targets of all edges leaving the nodes, as one array."""
+        starts = self.indptr[nodes]
+        counts = self.degree[nodes]
+        # position of each edge within its node's slice of indices
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        return self.indices[np.repeat(starts, counts) + offsets]
+
+    def step(self):
+        state, rng = self.state, self.rng
+        infected = np.flatnonzero(state == INFECTED)
+
+        # Try to infect the susceptible neighbors, once per infected neighbor
+        targets = self.edges_from(infected)
+        targets = targets[state[targets] == SUSCEPTIBLE]
+        hits = rng.random(len(targets)) < self.virus_spread_chance
+        # a node can be hit by several infected neighbors
+        infections = np.unique(targets[hits])
+        state[infections] = INFECTED
+
+        # Check the situation of the nodes infected at the start of the step
+        checking = infected[rng.random(len(infected)) < self.virus_check_frequency]
+        recovered = checking[rng.random(len(checking)) < self.recovery_chance]
+        resistant = rng.random(len(recovered)) < self.gain_resistance_chance
+        state[recovered] = np.where(resistant, RESISTANT, SUSCEPTIBLE)
+
+        new_resistant = int(np.count_nonzero(resistant))
+        self.transitions = {
+            "New Infections": len(infections),
+            "Recoveries": len(recovered),
+            "New Resistant": new_resistant,
+        }
+        self.counts[SUSCEPTIBLE] += len(recovered) - new_resistant - len(infections)
+        self.counts[INFECTED] += len(infections) - len(recovered)
+        self.counts[RESISTANT] += new_resistant
+
+        self.schedule.step()
+        # collect data
+        self.datacollector.collect(self)
+
+    def run_model(self, n):
+        for i in range(n):
+            self.step()
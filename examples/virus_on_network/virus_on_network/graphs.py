@@ -0,0 +1,184 @@
+"""
+Graph sources for the network models.
+
+CSRGraph holds an undirected graph with nodes 0..n-1 as compressed sparse row
+(CSR) arrays, which take a few bytes per edge where a networkx Graph takes a
+few hundred. Graphs can be generated as sparse G(n, p) random graphs in time
+proportional to their number of nodes and edges, or loaded from edge lists
+stored as .npy or Parquet files, without ever building networkx objects. The
+CSR arrays can be saved and memory-mapped back, so that large graphs are
+converted once and then shared between runs and processes.
+
+The networkx view of a graph, which NetworkGrid and the visualization need, is
+only built the first time it is asked for.
+"""
+
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+
+
+def gnp_edges(n, p, rng):
+    """
+    Return the edges of a G(n, p) random graph as an (m, 2) array of node
+    pairs (i, j) with i < j, drawn with the NumPy Generator rng.
+
+    The number of edges is drawn first, then that many distinct node pairs,
+    so this takes O(n + m) time and memory rather than a draw per node pair
+    like nx.erdos_renyi_graph.
+    """
+    pairs = n * (n - 1) // 2
+    if pairs == 0 or p <= 0:
+        return np.empty((0, 2), dtype=np.int64)
+    m = rng.binomial(pairs, min(p, 1.0))
+    k = rng.choice(pairs, m, replace=False, shuffle=False).astype(np.int64)
+    # pair k is (i, j) with k = j * (j - 1) / 2 + i and i < j
+    j = ((1 + np.sqrt(1 + 8 * k.astype(np.float64))) // 2).astype(np.int64)
+    # correct the float square root where it rounded to the wrong row
+    j[j * (j - 1) // 2 > k] -= 1
+    j[(j + 1) * j // 2 <= k] += 1
+    i = k - j * (j - 1) // 2
+    return np.column_stack([i, j])
+
+
+def load_edges(path):
+    """
+    Return the edge list stored in a file as an (m, 2) array of node indices.
+
+    .npy files must hold an (m, 2) integer array and are memory-mapped.
+    Parquet files are read with pandas, which needs pyarrow or fastparquet,
+    and their first two columns are taken as the source and target nodes.
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    if path.suffix in (".parquet", ".pq"):
+        import pandas as pd
+
+        frame = pd.read_parquet(path)
+        return frame.iloc[:, :2].to_numpy(dtype=np.int64)
+    raise ValueError(f"Unsupported edge list format: {path.suffix}")
+
+
+class CSRGraph:
+    """
+    An undirected graph with nodes 0..n-1 as CSR arrays: the neighbors of node
+    i are indices[indptr[i]:indptr[i + 1]], and every edge is stored once in
+    each direction.
+    """
+
+    def __init__(self, indptr, indices):
+        self.indptr = indptr
+        self.indices = indices
+        self._G = None
+
+    @classmethod
+    def from_edges(cls, edges, num_nodes=None):
+        """
+        Create a graph from an (m, 2) array of edges. Without num_nodes, the
+        nodes are 0 up to the largest node in the edges.
+
+        Like networkx.Graph, the graph is simple: self-loops are dropped, and
+        an edge given more than once, in either direction, is kept once.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if num_nodes is None:
+            num_nodes = int(edges.max()) + 1 if len(edges) else 0
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        edges = np.unique(np.sort(edges, axis=1), axis=0)
+        sources = np.concatenate([edges[:, 0], edges[:, 1]])
+        targets = np.concatenate([edges[:, 1], edges[:, 0]])
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+        return cls(indptr, targets[order])
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Create a graph from a networkx Graph with nodes 0..n-1."""
+        graph = cls.from_edges(np.array(G.edges()), G.number_of_nodes())
+        graph._G = G
+        return graph
+
+    @classmethod
+    def gnp(cls, n, p, rng):
+        """Create a G(n, p) random graph, see gnp_edges()."""
+        return cls.from_edges(gnp_edges(n, p, rng), n)
+
+    @classmethod
+    def load(cls, path, cache_dir=None):
+        """
+        Load a graph from an edge list file, see load_edges(). With a
+        cache_dir, the CSR arrays are saved there on the first load and
+        memory-mapped from there on every later load.
+        """
+        if cache_dir is not None and (Path(cache_dir) / "indptr.npy").exists():
+            return cls.open(cache_dir)
+        graph = cls.from_edges(load_edges(path))
+        if cache_dir is None:
+            return graph
+        graph.save(cache_dir)
+        return cls.open(cache_dir)
+
+    def save(self, directory):
+        """Save the CSR arrays as .npy files in a directory."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "indptr.npy", self.indptr)
+        np.save(directory / "indices.npy", self.indices)
+
+    @classmethod
+    def open(cls, directory):
+        """Memory-map a graph saved with save(), read-only."""
+        directory = Path(directory)
+        return cls(
+            np.load(directory / "indptr.npy", mmap_mode="r"),
+            np.load(directory / "indices.npy", mmap_mode="r"),
+        )
+
+    @property
+    def num_nodes(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.indices) // 2
+
+    @property
+    def degree(self):
+        """The degree of every node, as an array."""
+        return np.diff(self.indptr)
+
+    def neighbors(self, node):
+        """Return the neighbors of a node, as an array view."""
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def edges(self):
+        """Return every edge once, as an (m, 2) array of pairs (i, j), i < j."""
+        sources = np.repeat(np.arange(self.num_nodes), self.degree)
+        upper = sources < self.indices
+        return np.column_stack([sources[upper], self.indices[upper]])
+
+    @property
+    def G(self):
+        """The graph as a networkx Graph, built the first time it is used."""
+        if self._G is None:
+            G = nx.Graph()
+            G.add_nodes_from(range(self.num_nodes))
+            G.add_edges_from(self.edges().tolist())
+            self._G = G
+        return self._G
+
+
+def make_graph(graph, num_nodes, p, rng):
+    """
+    Return the CSRGraph a model runs on: graph itself if it is a CSRGraph, the
+    graph loaded from the edge list file graph if it is a path, or otherwise
+    a G(num_nodes, p) random graph drawn with rng.
+    """
+    if isinstance(graph, CSRGraph):
+        return graph
+    if graph is not None:
+        return CSRGraph.load(graph)
+    return CSRGraph.gnp(num_nodes, p, rng)
@@ -1,8 +1,10 @@
 import math
 from enum import Enum
-import networkx as nx
 
 import mesa
+import numpy as np
+
+from .graphs import make_graph
 
 
 class State(Enum):
@@ -11,8 +13,12 @@ class State(Enum):
     RESISTANT = 2
 
 
+# per-step transition counts, kept when the model counts transitions
+TRANSITIONS = ("New Infections", "Recoveries", "New Resistant")
+
+
 def number_state(model, state):
-    return sum(1 for a in model.grid.get_all_cell_contents() if a.state is state)
+    return model.state_counts[state]
 
 
 def number_infected(model):
@@ -28,7 +34,13 @@ def number_resistant(model):
 
 
 class VirusOnNetwork(mesa.Model):
-    """A virus model with some number of agents"""
+    """
+    A virus model with some number of agents.
+
+    The number of agents in each state is counted as agents change state.
+    With count_transitions, the new infections, recoveries and new resistant
+    agents of every step are counted too, and collected as model variables.
+    """
 
     def __init__(
         self,
@@ -39,27 +51,41 @@ class VirusOnNetwork(mesa.Model):
         virus_check_frequency=0.4,
         recovery_chance=0.3,
         gain_resistance_chance=0.5,
+        graph=None,
+        count_transitions=False,
+        seed=None,
     ):
-        self.num_nodes = num_nodes
-        prob = avg_node_degree / self.num_nodes
-        self.G = nx.erdos_renyi_graph(n=self.num_nodes, p=prob)
+        prob = avg_node_degree / num_nodes
+        # a CSRGraph, an edge list file, or None for a G(n, p) random graph
+        self.graph = make_graph(graph, num_nodes, prob, np.random.default_rng(seed))
+        self.num_nodes = self.graph.num_nodes
+        self.G = self.graph.G
         self.grid = mesa.space.NetworkGrid(self.G)
         self.schedule = mesa.time.RandomActivation(self)
         self.initial_outbreak_size = (
-            initial_outbreak_size if initial_outbreak_size <= num_nodes else num_nodes
+            initial_outbreak_size
+            if initial_outbreak_size <= self.num_nodes
+            else self.num_nodes
         )
         self.virus_spread_chance = virus_spread_chance
         self.virus_check_frequency = virus_check_frequency
         self.recovery_chance = recovery_chance
         self.gain_resistance_chance = gain_resistance_chance
 
-        self.datacollector = mesa.DataCollector(
-            {
-                "Infected": number_infected,
-                "Susceptible": number_susceptible,
-                "Resistant": number_resistant,
-            }
-        )
+        # number of agents in each state, kept up to date by change_state()
+        self.state_counts = {state: 0 for state in State}
+        self.transitions = dict.fromkeys(TRANSITIONS, 0) if count_transitions else None
+
+        model_reporters = {
+            "Infected": number_infected,
+            "Susceptible": number_susceptible,
+            "Resistant": number_resistant,
+        }
+        if count_transitions:
+            model_reporters.update(
+                {name: lambda m, name=name: m.transitions[name] for name in TRANSITIONS}
+            )
+        self.datacollector = mesa.DataCollector(model_reporters)
 
         # Create agents
         for i, node in enumerate(self.G.nodes()):
@@ -92,7 +118,28 @@ class VirusOnNetwork(mesa.Model):
         except ZeroDivisionError:
             return math.inf
 
+    def change_state(self, old, new):
+        """
+        Record that an agent went from state old, None for a new agent, to
+        state new.
+        """
+        if old is new:
+            return
+        if old is not None:
+            self.state_counts[old] -= 1
+        self.state_counts[new] += 1
+        if self.transitions is None:
+            return
+        if new is State.INFECTED:
+            self.transitions["New Infections"] += 1
+        elif old is State.INFECTED:
+            self.transitions["Recoveries"] += 1
+        if new is State.RESISTANT:
+            self.transitions["New Resistant"] += 1
+
     def step(self):
+        if self.transitions is not None:
+            self.transitions = dict.fromkeys(TRANSITIONS, 0)
         self.schedule.step()
         # collect data
         self.datacollector.collect(self)
@@ -115,6 +162,7 @@ class VirusAgent(mesa.Agent):
     ):
         super().__init__(unique_id, model)
 
+        self._state = None
         self.state = initial_state
 
         self.virus_spread_chance = virus_spread_chance
@@ -122,6 +170,15 @@ class VirusAgent(mesa.Agent):
         self.recovery_chance = recovery_chance
         self.gain_resistance_chance = gain_resistance_chance
 
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        self.model.change_state(self._state, state)
+        self._state = state
+
     def try_to_infect_neighbors(self):
         neighbors_nodes = self.model.grid.get_neighbors(self.pos, include_center=False)
         susceptible_neighbors = [
@@ -2,54 +2,25 @@ import math
 
 import mesa
 
+from .DeltaNetworkModule import DeltaNetworkModule
 from .model import VirusOnNetwork, State, number_infected
 
 
-def network_portrayal(G):
+def node_states(model):
     # The model ensures there is always 1 agent per node
-
-    def node_color(agent):
-        return {State.INFECTED: "#FF0000", State.SUSCEPTIBLE: "#008000"}.get(
-            agent.state, "#808080"
-        )
-
-    def edge_color(agent1, agent2):
-        if State.RESISTANT in (agent1.state, agent2.state):
-            return "#000000"
-        return "#e8e8e8"
-
-    def edge_width(agent1, agent2):
-        if State.RESISTANT in (agent1.state, agent2.state):
-            return 3
-        return 2
-
-    def get_agents(source, target):
-        return G.nodes[source]["agent"][0], G.nodes[target]["agent"][0]
-
-    portrayal = dict()
-    portrayal["nodes"] = [
-        {
-            "size": 6,
-            "color": node_color(agents[0]),
-            "tooltip": f"id: {agents[0].unique_id}<br>state: {agents[0].state.name}",
-        }
-        for (_, agents) in G.nodes.data("agent")
-    ]
-
-    portrayal["edges"] = [
-        {
-            "source": source,
-            "target": target,
-            "color": edge_color(*get_agents(source, target)),
-            "width": edge_width(*get_agents(source, target)),
-        }
-        for (source, target) in G.edges
-    ]
-
-    return portrayal
-
-
-network = mesa.visualization.NetworkModule(network_portrayal, 500, 500)
+    return [agents[0].state.value for _, agents in model.G.nodes.data("agent")]
+
+
+# Node colors, tooltips and edge styles are derived from the node states in
+# the browser; only the states that changed are sent after the first frame.
+network = DeltaNetworkModule(
+    node_states,
+    state_names=[state.name for state in State],
+    state_colors=["#008000", "#FF0000", "#808080"],
+    highlight_states=[State.RESISTANT.value],
+    canvas_height=500,
+    canvas_width=500,
+)
 chart = mesa.visualization.ChartModule(
     [
         {"Label": "Infected", "Color": "#FF0000"},